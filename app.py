@@ -1,21 +1,26 @@
 import os
+import numpy as np
 import pandas as pd
 import streamlit as st
 from espn_api.basketball import League
 
 from get_week_range import find_week_range
+from history_store import list_snapshots, read_snapshot
+from season_schedule import SEASON_FILE, load_season_schedule
 from utils import (
     TEAM_ABBREVIATION_MAPPING,
     apply_batch_toggle,
     build_added_player_schedule_rows,
     calculate_projected_stats,
-    calculate_projected_stats_simple,
     enforce_no_game_constraints,
     filter_future_columns,
     get_all_player_names,
+    get_approximate_players,
+    get_league_strength,
     get_player_avg,
     get_player_stats_map,
     get_team_schedule_data,
+    get_unresolved_players,
     prepare_comparison_data,
     prepare_roster_data,
 )
@@ -49,19 +54,27 @@ def show_history_data():
         st.error(f"Directory not found: {DATA_DIR}")
         return
 
+    # Latest crawl (current_*.pkl) first, then the dated snapshots in the store
     pkl_files = get_pickle_files(DATA_DIR)
+    snapshots = {
+        f"{date}_{data_type}": (date, data_type) for date, data_type in list_snapshots()
+    }
 
-    if not pkl_files:
+    if not pkl_files and not snapshots:
         st.warning("No .pkl files found in history_data directory.")
         return
 
-    selected_file = st.selectbox("Select a file to view:", pkl_files)
+    selected_file = st.selectbox(
+        "Select a file to view:", pkl_files + list(snapshots.keys())
+    )
 
     if selected_file:
-        file_path = os.path.join(DATA_DIR, selected_file)
         try:
-            # Read pickle file
-            df = pd.read_pickle(file_path)
+            if selected_file in snapshots:
+                df = read_snapshot(*snapshots[selected_file])
+            else:
+                # Read pickle file
+                df = pd.read_pickle(os.path.join(DATA_DIR, selected_file))
 
             st.subheader(f"Data: {selected_file}")
             st.write(f"Shape: {df.shape}")
@@ -73,6 +86,31 @@ def show_history_data():
             st.error(f"Error loading file {selected_file}: {e}")
 
 
+def warn_unresolved_players(stats_map, player_names):
+    """
+    Show roster players that matched no stats row (they project zero) and
+    players matched by an approximate name, so a wrong join is visible.
+    """
+    misses = get_unresolved_players(stats_map)
+    missing = [name for name in player_names if name in misses]
+    if missing:
+        details = []
+        for name in missing:
+            candidate = misses[name].candidate
+            details.append(f"{name} (closest: {candidate})" if candidate else name)
+        st.warning("No stats found for: " + ", ".join(details))
+
+    approximate = get_approximate_players(stats_map)
+    matched = [name for name in player_names if name in approximate]
+    if matched:
+        details = [
+            f"{name} → {approximate[name].key} "
+            f"({approximate[name].method} {approximate[name].score:.2f})"
+            for name in matched
+        ]
+        st.info("Matched by approximate name: " + ", ".join(details))
+
+
 @st.cache_resource(ttl=3600)
 def get_league():
     """Initialize and cache the ESPN League object to avoid repeated API calls."""
@@ -119,6 +157,7 @@ def show_team_rosters():
 
             if not df_roster.empty:
                 st.dataframe(df_roster, width="stretch")
+                warn_unresolved_players(stats_map, [p.name for p in team.roster])
             else:
                 st.info("This team has no players on the roster.")
 
@@ -126,18 +165,33 @@ def show_team_rosters():
         st.error(f"Failed to fetch data from ESPN API: {e}")
 
 
+@st.cache_resource
+def _load_season_schedule(mtime):
+    season = load_season_schedule()
+    # Week frames are views shared by every session; keep them read-only
+    season.games.flags.writeable = False
+    return season
+
+
+def get_season_schedule():
+    """Load season.npz once per file version (shared across sessions)."""
+    if not os.path.exists(SEASON_FILE):
+        return None
+    return _load_season_schedule(os.path.getmtime(SEASON_FILE))
+
+
 def get_available_weeks():
-    """Scan weekly_schedule folder for available weeks."""
-    schedule_dir = os.path.join(os.path.dirname(__file__), "weekly_schedule")
-    if not os.path.exists(schedule_dir):
-        return []
+    """List the weeks of the season schedule: ['w1', 'w2'...]."""
+    season = get_season_schedule()
+    return season.weeks() if season is not None else []
 
-    files = [
-        f for f in os.listdir(schedule_dir) if f.startswith("w") and f.endswith(".pkl")
-    ]
-    # Sort by week number: w1, w2, ...
-    files.sort(key=lambda x: int(x[1:-4]))
-    return [f[:-4] for f in files]  # Return ['w1', 'w2'...]
+
+def get_week_schedule(week_str):
+    """Week schedule as a date x team frame viewing the season matrix, or None."""
+    season = get_season_schedule()
+    if season is None or week_str not in season.periods:
+        return None
+    return season.week_frame(week_str)
 
 
 def render_team_schedule_ui(
@@ -286,7 +340,7 @@ def show_matchup_results():
     # Select Week
     weeks = get_available_weeks()
     if not weeks:
-        st.warning("No weekly schedule files found.")
+        st.warning("No season schedule found.")
         return
 
     # Calculate Current PT Date & Defaults
@@ -445,14 +499,9 @@ def show_matchup_results():
                     )
 
                     # Load Weekly Schedule
-                    schedule_path = os.path.join(
-                        os.path.dirname(__file__), "weekly_schedule", f"w{week_num}.pkl"
-                    )
-                    df_schedule = None
-                    if os.path.exists(schedule_path):
-                        df_schedule = pd.read_pickle(schedule_path)
-                    else:
-                        st.warning(f"Schedule file not found for Week {week_num}")
+                    df_schedule = get_week_schedule(f"w{week_num}")
+                    if df_schedule is None:
+                        st.warning(f"Schedule not found for Week {week_num}")
 
                     # --- Add Players + Schedule Tables ---
                     all_player_names = get_all_player_names(stats_map)
@@ -508,6 +557,9 @@ def show_matchup_results():
                         aliases,
                         schedule_df=df_schedule,
                     )
+                    warn_unresolved_players(
+                        stats_map, [p.name for p in t1_obj.roster + t2_obj.roster]
+                    )
 
                     # --- Render Prediction Table (Transposed) ---
                     t1_proj_row = {}
@@ -530,6 +582,34 @@ def show_matchup_results():
         st.error(f"Error fetching matchup data: {e}")
 
 
+WIN_STYLE = "background-color: #2d6a2d; color: white"
+LOSE_STYLE = "background-color: #8b2020; color: white"
+TARGET_STYLE = "font-weight: bold; background-color: #1a3a5c; color: white"
+
+
+def strength_table_styles(df_result, outcomes, wins, categories):
+    """
+    CSS of a team strength table: target row first, then one row per
+    opponent. outcomes: opponents x categories +1/-1/0 as the target wins,
+    loses or ties (lower-is-better already flipped); wins: per opponent.
+    """
+    styles = np.full(df_result.shape, "", dtype=object)
+    shown = [i for i, k in enumerate(categories) if k in df_result.columns]
+    cols = [df_result.columns.get_loc(categories[i]) for i in shown]
+    styles[1:, cols] = np.where(
+        outcomes[:, shown] > 0,
+        WIN_STYLE,
+        np.where(outcomes[:, shown] < 0, LOSE_STYLE, ""),
+    )
+    if "Wins" in df_result.columns:
+        half = len(categories) / 2
+        styles[1:, df_result.columns.get_loc("Wins")] = np.where(
+            wins > half, LOSE_STYLE, np.where(wins < half, WIN_STYLE, "")
+        )
+    styles[0, :] = TARGET_STYLE
+    return pd.DataFrame(styles, index=df_result.index, columns=df_result.columns)
+
+
 def show_team_strength():
     st.header("Team Strength Evaluation")
     st.caption("預測你的隊伍在未來每週對上所有隊伍的表現")
@@ -593,7 +673,6 @@ def show_team_strength():
             label_visibility="collapsed",
             key="strength_target",
         )
-        target_team = team_map[target_team_name]
 
         # Load stats
         stats_map = get_player_stats_map(os.path.dirname(__file__), stats_file)
@@ -616,7 +695,7 @@ def show_team_strength():
             for p in team.roster:
                 if p.injuryStatus == "OUT":
                     continue
-                p_stats = get_player_avg(p.name, stats_map)
+                p_stats = get_player_avg(p.name, stats_map, p.playerId)
                 if p_stats:
                     default_selected.append(p.name)
 
@@ -637,158 +716,70 @@ def show_team_strength():
         future_weeks = [w for w in weeks if int(w[1:]) >= 19]
 
         if not future_weeks:
-            st.warning("No schedule files found for w18 onwards.")
+            st.warning("No schedule found for w19 onwards.")
             return
 
+        # Every team against every other for every future week, cached;
+        # changing the target team only slices it
+        hide_cols = ["FGM", "FGA", "FTM", "FTA"]
+        strength = get_league_strength(
+            teams,
+            get_season_schedule(),
+            future_weeks,
+            stats_map,
+            desired_order,
+            aliases,
+            lower_is_better=lower_is_better,
+            unscored=hide_cols,
+            active_players=team_active_players,
+        )
+        pct_cols = np.array([k in ["AFG%", "FT%"] for k in desired_order])
+
+        st.markdown("---")
+        st.subheader("League Power Table")
+        st.caption("每支隊伍在剩餘每週對上其他所有隊伍的類別勝負與對戰戰績")
+        df_power = pd.DataFrame(
+            strength.power_table(), index=strength.team_names
+        ).sort_values(["Matchups W", "Cat W"], ascending=False)
+        st.dataframe(df_power, width="stretch")
+
+        target = strength.team_index[target_team_name]
+        opponents = strength.opponents(target_team_name)
+
         # Process each week
-        for week_str in future_weeks:
+        for week_idx, week_str in enumerate(future_weeks):
             week_num = int(week_str[1:])
-            schedule_path = os.path.join(
-                os.path.dirname(__file__), "weekly_schedule", f"{week_str}.pkl"
-            )
-            if not os.path.exists(schedule_path):
-                continue
-
-            df_schedule = pd.read_pickle(schedule_path)
 
             st.markdown("---")
             st.subheader(f"Week {week_num}")
 
-            # Calculate target team stats
-            target_stats = calculate_projected_stats_simple(
-                target_team,
-                df_schedule,
-                stats_map,
-                desired_order,
-                aliases,
-                active_players=team_active_players.get(target_team_name),
+            # First row = target team (reference), then each opponent
+            values = strength.totals[[target] + opponents, week_idx]
+            values = np.where(pct_cols, np.round(values * 100, 2), np.round(values, 1))
+            df_result = pd.DataFrame(
+                values,
+                index=[f"⭐ {target_team_name}"]
+                + [strength.team_names[o] for o in opponents],
+                columns=desired_order,
             )
-
-            # Build rows: first row = target team (reference), then each opponent
-            rows = []
-
-            # Target team reference row
-            target_row = {"Team": f"⭐ {target_team_name}"}
-            for k in desired_order:
-                val = target_stats.get(k, 0)
-                if k in ["AFG%", "FT%"]:
-                    target_row[k] = round(val * 100, 2)
-                else:
-                    target_row[k] = round(val, 1)
-            target_row["Wins"] = "-"
-            rows.append(target_row)
-
-            # Opponent rows
-            for opp_name in team_names:
-                if opp_name == target_team_name:
-                    continue
-                opp_team = team_map[opp_name]
-                opp_stats = calculate_projected_stats_simple(
-                    opp_team,
-                    df_schedule,
-                    stats_map,
-                    desired_order,
-                    aliases,
-                    active_players=team_active_players.get(opp_name),
-                )
-
-                opp_row = {"Team": opp_name}
-                wins = 0
-                skip_for_wins = {"FGM", "FGA", "FTM", "FTA"}
-                for k in desired_order:
-                    t_val = target_stats.get(k, 0)
-                    o_val = opp_stats.get(k, 0)
-                    if k in ["AFG%", "FT%"]:
-                        opp_row[k] = round(o_val * 100, 2)
-                    else:
-                        opp_row[k] = round(o_val, 1)
-
-                    # Don't count hidden columns in wins
-                    if k in skip_for_wins:
-                        continue
-
-                    # Determine win/loss for target team
-                    if k in lower_is_better:
-                        if t_val < o_val:
-                            wins += 1
-                    else:
-                        if t_val > o_val:
-                            wins += 1
-                opp_row["Wins"] = str(wins)
-                rows.append(opp_row)
-
-            df_result = pd.DataFrame(rows)
-            df_result = df_result.set_index("Team")
+            df_result.index.name = "Team"
+            df_result["Wins"] = ["-"] + [
+                str(w) for w in strength.wins[target, opponents, week_idx]
+            ]
 
             # Hide detailed columns
-            hide_cols = ["FGM", "FGA", "FTM", "FTA"]
             df_result = df_result.drop(
                 columns=[c for c in hide_cols if c in df_result.columns]
             )
 
-            # Apply styling: color cells based on W/L vs target
-            def color_cells(df):
-                styles = pd.DataFrame("", index=df.index, columns=df.columns)
-                target_vals = df.iloc[0]  # Reference row
-
-                for idx in df.index[1:]:  # Skip target row
-                    for col in desired_order:
-                        if col not in df.columns:
-                            continue
-                        t_val = target_vals[col]
-                        o_val = df.at[idx, col]
-                        try:
-                            t_val = float(t_val)
-                            o_val = float(o_val)
-                        except (ValueError, TypeError):
-                            continue
-
-                        if col in lower_is_better:
-                            if t_val < o_val:
-                                styles.at[idx, col] = (
-                                    "background-color: #2d6a2d; color: white"
-                                )
-                            elif t_val > o_val:
-                                styles.at[idx, col] = (
-                                    "background-color: #8b2020; color: white"
-                                )
-                        else:
-                            if t_val > o_val:
-                                styles.at[idx, col] = (
-                                    "background-color: #2d6a2d; color: white"
-                                )
-                            elif t_val < o_val:
-                                styles.at[idx, col] = (
-                                    "background-color: #8b2020; color: white"
-                                )
-
-                # Style the Wins column
-                if "Wins" in df.columns:
-                    for idx in df.index[1:]:
-                        val = df.at[idx, "Wins"]
-                        try:
-                            wins_val = int(val)
-                            total = len(desired_order)
-                            if wins_val > total / 2:
-                                styles.at[idx, "Wins"] = (
-                                    "background-color: #8b2020; color: white"
-                                )
-                            elif wins_val < total / 2:
-                                styles.at[idx, "Wins"] = (
-                                    "background-color: #2d6a2d; color: white"
-                                )
-                        except (ValueError, TypeError):
-                            pass
-
-                # Style target row (bold)
-                for col in styles.columns:
-                    styles.loc[styles.index[0], col] = (
-                        "font-weight: bold; background-color: #1a3a5c; color: white"
-                    )
-
-                return styles
-
-            styled_df = df_result.style.apply(color_cells, axis=None)
+            # Apply styling: color cells from the target's W/L masks
+            styles = strength_table_styles(
+                df_result,
+                strength.outcomes[target, opponents, week_idx],
+                strength.wins[target, opponents, week_idx],
+                desired_order,
+            )
+            styled_df = df_result.style.apply(lambda _: styles, axis=None)
             st.dataframe(styled_df, width="stretch")
 
     except Exception as e:
@@ -0,0 +1,82 @@
+"""
+Time each parsing stage of player_stat_crawler over saved rankings fixtures.
+
+Runs offline against the sanitized page in benchmarks/fixtures:
+    python benchmarks/bench_crawler_parse.py
+To time fresh pages, record them with the live site first (recording
+overwrites benchmarks/fixtures unless --fixture-dir is given):
+    python player_stat_crawler.py --data-types 0,1 --record --no-store --fixture-dir fixtures
+    python benchmarks/bench_crawler_parse.py --fixture-dir fixtures
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from timing import FIXTURE_DIR, time_stage  # noqa: E402
+from player_stat_crawler import (  # noqa: E402
+    TABLE_ID,
+    build_stats_table,
+    format_history_data,
+    parse_table_html,
+)
+
+
+def bench_fixture(path, repeat):
+    html = path.read_text(encoding="utf-8")
+
+    (headers, table_data), t_extract = time_stage(
+        lambda: parse_table_html(html, table_id=TABLE_ID), repeat
+    )
+    stats_table, t_filter = time_stage(
+        lambda: build_stats_table(headers, table_data), repeat
+    )
+    history_table, t_format = time_stage(
+        lambda: format_history_data(stats_table), repeat
+    )
+    return len(history_table), {
+        "extract": t_extract,
+        "filter": t_filter,
+        "format": t_format,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixture-dir", type=str, default=str(FIXTURE_DIR))
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="fail if the median total per fixture exceeds this many ms",
+    )
+    args = parser.parse_args()
+
+    fixtures = sorted(Path(args.fixture_dir).glob("rankings_*.html"))
+    if not fixtures:
+        print(f"No rankings_*.html fixtures in {args.fixture_dir}")
+        sys.exit(1)
+
+    over_budget = False
+    print(f"{'fixture':<22}{'rows':>6}{'extract':>10}{'filter':>10}{'format':>10}")
+    for path in fixtures:
+        n_rows, timings = bench_fixture(path, args.repeat)
+        medians = {k: statistics.median(v) for k, v in timings.items()}
+        print(
+            f"{path.name:<22}{n_rows:>6}"
+            + "".join(f"{medians[k]:>8.2f}ms" for k in ["extract", "filter", "format"])
+        )
+        if args.budget_ms is not None and sum(medians.values()) > args.budget_ms:
+            over_budget = True
+
+    if over_budget:
+        print(f"Median parse time exceeded the {args.budget_ms}ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
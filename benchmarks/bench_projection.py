@@ -0,0 +1,170 @@
+"""
+Compare utils.calculate_projected_stats with the former per-cell loop.
+
+Builds matchup-editor frames from a stats snapshot and the season schedule,
+checks that both implementations format identical results, and times them:
+    python benchmarks/bench_projection.py --stats history_data/current_1.pkl
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from timing import median_ms  # noqa: E402
+from season_schedule import load_season_schedule  # noqa: E402
+from utils import (  # noqa: E402
+    TEAM_ABBREVIATION_MAPPING,
+    calculate_projected_stats,
+    get_player_avg,
+    load_stats_map,
+)
+
+DESIRED_ORDER = [
+    "AFG%",
+    "FT%",
+    "3PM",
+    "TREB",
+    "AST",
+    "STL",
+    "BLK",
+    "TO",
+    "PTS",
+    "FGM",
+    "FGA",
+    "FTM",
+    "FTA",
+]
+ALIASES = {"TREB": "REB"}
+
+
+def legacy_calculate_projected_stats(
+    edited_df, current_stats, s_map, desired_order, alias_mapping, schedule_df=None
+):
+    """The row/date/category loop calculate_projected_stats replaced."""
+    base_totals = {k: 0.0 for k in desired_order if k not in ["AFG%", "FT%"]}
+    for k in base_totals:
+        if k in current_stats:
+            base_totals[k] = current_stats[k].get("value", 0)
+        elif k in alias_mapping and alias_mapping[k] in current_stats:
+            base_totals[k] = current_stats[alias_mapping[k]].get("value", 0)
+
+    if not edited_df.empty:
+        df_players = edited_df.iloc[1:]
+        date_cols = [
+            c for c in df_players.columns if c not in ["Player", "Pos", "Team"]
+        ]
+        for _, row in df_players.iterrows():
+            games_active = 0
+            sched_col = TEAM_ABBREVIATION_MAPPING.get(row["Team"], row["Team"])
+            for d in date_cols:
+                if row[d] is True:
+                    if schedule_df is not None:
+                        if sched_col in schedule_df.columns and d in schedule_df.index:
+                            if schedule_df.loc[d, sched_col] == 1:
+                                games_active += 1
+                    else:
+                        games_active += 1
+            if games_active > 0:
+                p_stats = get_player_avg(row["Player"], s_map)
+                if p_stats:
+                    for k in base_totals:
+                        val = float(p_stats[k]) if k in p_stats else 0.0
+                        base_totals[k] += val * games_active
+
+    fgm = base_totals.get("FGM", 0)
+    fga = base_totals.get("FGA", 0)
+    threepm = base_totals.get("3PM", 0)
+    ftm = base_totals.get("FTM", 0)
+    fta = base_totals.get("FTA", 0)
+    afg_pct = (fgm + 0.5 * threepm) / fga if fga > 0 else 0.0
+    ft_pct = ftm / fta if fta > 0 else 0.0
+
+    final_stats = {}
+    for k in desired_order:
+        if k == "AFG%":
+            final_stats[k] = f"{afg_pct * 100:.2f}%"
+        elif k == "FT%":
+            final_stats[k] = f"{ft_pct * 100:.2f}%"
+        else:
+            final_stats[k] = f"{base_totals.get(k, 0):.1f}"
+    return final_stats
+
+
+def build_editor_frame(stats_map, schedule_df, n_players, rng):
+    """Status row plus n_players rows checked on their team's game days."""
+    inverse_mapping = {v: k for k, v in TEAM_ABBREVIATION_MAPPING.items()}
+    dates = list(schedule_df.index)
+    keys = rng.choice(list(stats_map), size=n_players, replace=False)
+    rows = [
+        {
+            "Player": " ⚡ DAILY STATUS",
+            "Pos": "",
+            "Team": "",
+            **{d: True for d in dates},
+        }
+    ]
+    for key in keys:
+        stats = stats_map[key]
+        team = stats["TEAM"]
+        sched_col = TEAM_ABBREVIATION_MAPPING.get(team, team)
+        row = {
+            "Player": stats["PLAYER"],
+            "Pos": "F",
+            "Team": inverse_mapping.get(sched_col, team),
+        }
+        for d in dates:
+            if sched_col in schedule_df.columns and schedule_df.loc[d, sched_col]:
+                # Some games benched, like a manager would
+                row[d] = bool(rng.random() > 0.2)
+            else:
+                row[d] = None
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stats", type=str, default="history_data/current_1.pkl")
+    parser.add_argument("--players", type=int, default=15)
+    parser.add_argument("-n", "--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    stats_map = load_stats_map(args.stats)
+    season = load_season_schedule()
+    if season is None:
+        print("No season schedule; build weekly_schedule/season.npz first")
+        sys.exit(1)
+    rng = np.random.default_rng(0)
+
+    print(f"{'week':<6}{'days':>6}{'legacy':>12}{'vectorized':>12}{'speedup':>9}")
+    for week in season.weeks():
+        schedule_df = season.week_frame(week)
+        edited_df = build_editor_frame(stats_map, schedule_df, args.players, rng)
+        call_args = (edited_df, {}, stats_map, DESIRED_ORDER, ALIASES)
+
+        legacy, t_legacy = median_ms(
+            lambda: legacy_calculate_projected_stats(
+                *call_args, schedule_df=schedule_df
+            ),
+            args.repeat,
+        )
+        result, t_new = median_ms(
+            lambda: calculate_projected_stats(*call_args, schedule_df=schedule_df),
+            args.repeat,
+        )
+        if result != legacy:
+            print(f"{week}: results differ\n  legacy: {legacy}\n  new:    {result}")
+            sys.exit(1)
+        print(
+            f"{week:<6}{len(schedule_df):>6}{t_legacy:>10.2f}ms{t_new:>10.2f}ms"
+            f"{t_legacy / t_new:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Time schedule_parser over saved nba.com team schedule pages.
+
+Runs offline against the sanitized pages in benchmarks/fixtures (one with
+the __NEXT_DATA__ payload, one with only the rendered table):
+    python benchmarks/bench_schedule_parse.py
+To time fresh pages, record them with the live site first:
+    python gen_weekly_schedule.py -w all --no-cache --record-dir fixtures
+    python benchmarks/bench_schedule_parse.py --fixture-dir fixtures
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from timing import FIXTURE_DIR, time_stage  # noqa: E402
+from schedule_parser import (  # noqa: E402
+    FirstCellParser,
+    parse_next_data,
+    parse_schedule_page,
+    parse_schedule_table,
+)
+
+
+def parse_full_document(html):
+    """Baseline: run the HTML parser over the whole page."""
+    parser = FirstCellParser()
+    parser.feed(html)
+    parser.close()
+    return parser.first_cells
+
+
+def bench_fixture(path, repeat):
+    html = path.read_text(encoding="utf-8")
+
+    (game_dates, source), t_page = time_stage(lambda: parse_schedule_page(html), repeat)
+    _, t_json = time_stage(lambda: parse_next_data(html), repeat)
+    _, t_table = time_stage(lambda: parse_schedule_table(html), repeat)
+    _, t_full = time_stage(lambda: parse_full_document(html), repeat)
+    return (
+        len(game_dates),
+        source,
+        {"page": t_page, "json": t_json, "table": t_table, "full": t_full},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixture-dir", type=str, default=str(FIXTURE_DIR))
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="fail if the median parse time of any team page exceeds this many ms",
+    )
+    args = parser.parse_args()
+
+    fixtures = sorted(Path(args.fixture_dir).glob("schedule_*.html"))
+    if not fixtures:
+        print(f"No schedule_*.html fixtures in {args.fixture_dir}")
+        sys.exit(1)
+
+    stages = ["page", "json", "table", "full"]
+    over_budget = False
+    print(
+        f"{'fixture':<22}{'games':>6}{'source':>7}"
+        + "".join(f"{k:>10}" for k in stages)
+    )
+    for path in fixtures:
+        n_games, source, timings = bench_fixture(path, args.repeat)
+        medians = {k: statistics.median(v) for k, v in timings.items()}
+        print(
+            f"{path.name:<22}{n_games:>6}{str(source):>7}"
+            + "".join(f"{medians[k]:>8.2f}ms" for k in stages)
+        )
+        if args.budget_ms is not None and medians["page"] > args.budget_ms:
+            over_budget = True
+
+    if over_budget:
+        print(f"Median parse time exceeded the {args.budget_ms}ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Timing helpers shared by the benchmark scripts."""
+
+import statistics
+import time
+from pathlib import Path
+
+# Small sanitized pages committed so the parse benchmarks run on a clean checkout
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def time_stage(func, repeat):
+    """Call func repeat times; return (last result, [ms per call])."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, timings
+
+
+def median_ms(func, repeat):
+    """Call func repeat times; return (last result, median ms)."""
+    result, timings = time_stage(func, repeat)
+    return result, statistics.median(timings)
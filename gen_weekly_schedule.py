@@ -2,14 +2,24 @@ import os
 import sys
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+
+from http_cache import CACHE_DIR, MAX_AGE, MAX_BYTES, ResponseCache
+from season_schedule import SEASON_FILE, SeasonSchedule, load_season_schedule
+from schedule_parser import parse_schedule_page
+from schedule_fetch import (
+    MAX_WORKERS,
+    RATE_PER_HOST,
+    FetchFailure,
+    fetch_pages,
+    print_failure_report,
+)
 
 # Import the schedule dictionary from get_week_range
 # Assuming get_week_range.py is in the same directory
 try:
-    from get_week_range import schedule
+    from get_week_range import remaining_weeks, schedule
 except ImportError:
     print("Error: get_week_range.py not found.")
     sys.exit(1)
@@ -74,70 +84,230 @@ def gen_date_list_from_range(start_date, end_date):
     return date_list
 
 
-def scrape_week(week_name, start_date, end_date):
-    print(f"Scraping {week_name} ({start_date.date()} to {end_date.date()})...")
+def team_schedule_url(team_id):
+    return f"https://www.nba.com/team/{team_id}/schedule"
+
+
+def record_fixture(fixture_dir, team_name, content):
+    path = os.path.join(fixture_dir, f"schedule_{team_name}.html")
+    os.makedirs(fixture_dir, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def parse_team_game_dates(team_name, content):
+    """
+    Return the set of game dates ('Jan 26') on one team's schedule page, or
+    None when the page has no schedule data to parse.
+    """
+    game_dates, source = parse_schedule_page(content, team_id_dict[team_name])
+    if source is None:
+        print(f"  Warning: No schedule data found for {team_name}")
+        return None
+    return game_dates
+
+
+def scrape_season(
+    start_date,
+    end_date,
+    max_workers=MAX_WORKERS,
+    rate=RATE_PER_HOST,
+    cache=None,
+    record_dir=None,
+):
+    """
+    Fetch every team page once and build a date x team table of games.
+
+    Returns (season_table, failures); teams in failures (including pages
+    without schedule data) have no games filled. Pages the cache reports
+    unchanged reuse their stored parse. With
+    record_dir, every downloaded page is also saved there as a fixture.
+    """
+    print(f"Scraping season ({start_date.date()} to {end_date.date()})...")
 
     date_list = gen_date_list_from_range(start_date, end_date)
-    schedule_table = pd.DataFrame(columns=team_id_dict.keys(), index=date_list)
-    schedule_table = schedule_table.fillna(0)  # Init with 0
-
-    for team_name, team_id in team_id_dict.items():
-        url = f"https://www.nba.com/team/{team_id}/schedule"
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
-                # Look for the specific table body class used in previous script
-                tbody = soup.find("tbody", class_="Crom_body__UYOcU")
-
-                if tbody:
-                    rows = tbody.find_all("tr")
-                    for row in rows:
-                        cells = row.find_all("td")
-                        if cells:
-                            cell_data = [cell.get_text(strip=True) for cell in cells]
-                            game_date_str = cell_data[0]
-
-                            # Check if valid date format roughly (e.g. "Mon, Oct 20") - usually NBA site has "Oct 20" or "Mon Oct 20"
-                            # The previous script looked for exact match in date_list.
-                            # The NBA site format is typically "Day, Mon DD" or something.
-                            # Previous script logic: cell_data[0] in date_list.
-                            # We need to ensure we match the scraped string to our date_list format.
-                            # Debug: The previous script generated date_list like "Oct 20" and checked exact match.
-
-                            # Let's clean the cell data to match our format "MMM D"
-                            # Attempt to find if our generated date exists in the cell string
-                            for d in date_list:
-                                if d == game_date_str:
-                                    schedule_table.loc[d, team_name] = 1
-                                    break
-                else:
-                    print(f"  Warning: Table body not found for {team_name}")
-            else:
-                print(f"  Failed: {team_name} ({response.status_code})")
-        except Exception as e:
-            print(f"  Error {team_name}: {e}")
-
-    # Ensure output dir exists
-    out_dir = os.path.join(os.path.dirname(__file__), "weekly_schedule")
-    os.makedirs(out_dir, exist_ok=True)
-
-    pkl_path = os.path.join(out_dir, f"{week_name}.pkl")
-    schedule_table.to_pickle(pkl_path)
-    print(f"  Saved {pkl_path}")
-    return schedule_table
+    date_index = {label: i for i, label in enumerate(date_list)}
+    teams = list(team_id_dict)
+    games = np.zeros((len(date_list), len(teams)), dtype="int64")
+
+    urls = {name: team_schedule_url(team_id) for name, team_id in team_id_dict.items()}
+    responses, failures = fetch_pages(
+        urls, headers=headers, max_workers=max_workers, rate=rate, cache=cache
+    )
+    reused = 0
+    for team_name, response in responses.items():
+        if record_dir:
+            record_fixture(record_dir, team_name, response.content)
+        # Only parses that found schedule data are stored, so an empty one
+        # was cached before that rule and is parsed again
+        game_dates = getattr(response, "parsed", None)
+        if game_dates:
+            reused += 1
+        else:
+            game_dates = parse_team_game_dates(team_name, response.content)
+            if game_dates is None:
+                # An unparseable page is a failed fetch, not a team without
+                # games; drop it so the next run downloads it again
+                failures[team_name] = FetchFailure(
+                    team_name, urls[team_name], "no schedule data on page", 1
+                )
+                if cache:
+                    cache.discard(urls[team_name])
+                continue
+            if cache:
+                cache.save_parsed(response, sorted(game_dates))
+        rows = [date_index[d] for d in game_dates if d in date_index]
+        games[rows, teams.index(team_name)] = 1
+    if cache:
+        print(f"  {reused}/{len(responses)} team pages unchanged since last parse")
+    print_failure_report(failures)
+    season_table = pd.DataFrame(games, index=date_list, columns=teams)
+    return season_table, failures
+
+
+def load_or_create_season():
+    season = load_season_schedule()
+    if season is None:
+        season = SeasonSchedule.empty(list(team_id_dict))
+    return season
+
+
+def save_season(season):
+    season.save()
+    print(f"  Saved {SEASON_FILE}")
+
+
+def set_fetched_games(season, start_date, season_table, failures):
+    """Write the fetched teams' games; failed teams keep what season holds."""
+    teams = [team for team in season_table.columns if team not in failures]
+    season.set_games(start_date, season_table[teams].to_numpy(), teams)
+
+
+def keep_stored_games(season, stored, failures):
+    """Copy the failed teams' games from stored on the dates both cover."""
+    teams = [team for team in failures if team in stored.team_index]
+    first = max(season.dates[0], stored.dates[0])
+    last = min(season.dates[-1], stored.dates[-1])
+    if not teams or first > last:
+        return
+    start = stored.day_index(first)
+    rows = stored.games[start : start + int((last - first).astype(int)) + 1]
+    cols = [stored.team_index[team] for team in teams]
+    season.set_games(first, rows[:, cols], teams)
+
+
+def scrape_week(week_name, start_date, end_date, **fetch_options):
+    print(f"Scraping {week_name} ({start_date.date()} to {end_date.date()})...")
+    week_table, failures = scrape_season(start_date, end_date, **fetch_options)
+    season = load_or_create_season()
+    # A failed fetch is not a week without games: keep stored games
+    set_fetched_games(season, start_date, week_table, failures)
+    save_season(season)
+    return season.week_frame(week_name), failures
 
 
 import argparse
 
 
-def run_all_weeks():
+def run_all_weeks(**fetch_options):
     print("Generating schedules for ALL weeks...")
     # Sort keys to process in order w1, w2, ...
     sorted_weeks = sorted(schedule.keys(), key=lambda x: int(x[1:]))
-    for week_name in sorted_weeks:
-        start_date, end_date = schedule[week_name]
-        scrape_week(week_name, start_date, end_date)
+    season_start = schedule[sorted_weeks[0]][0]
+    season_end = schedule[sorted_weeks[-1]][1]
+
+    # One request per team for the whole season
+    season_table, failures = scrape_season(season_start, season_end, **fetch_options)
+    season = SeasonSchedule.empty(list(team_id_dict))
+    set_fetched_games(season, season_start, season_table, failures)
+    stored = load_season_schedule()
+    if failures and stored is not None:
+        keep_stored_games(season, stored, failures)
+    save_season(season)
+    return failures
+
+
+def diff_week(old_table, new_table):
+    """Return [(team, date, 'added' | 'removed')] between two week tables."""
+    changed = old_table.to_numpy() != new_table.to_numpy()
+    changes = []
+    for row, col in zip(*np.nonzero(changed)):
+        kind = "added" if new_table.iat[row, col] else "removed"
+        changes.append((new_table.columns[col], new_table.index[row], kind))
+    return sorted(changes)
+
+
+def print_change_report(report):
+    if not report:
+        print("No schedule changes.")
+        return
+    print("Schedule changes:")
+    by_team = {}
+    for week_name, changes in report.items():
+        if changes is None:
+            print(f"  {week_name}: new file")
+            continue
+        for team, day, kind in changes:
+            print(f"  {week_name}: {team} {kind} {day}")
+            by_team.setdefault(team, {"added": [], "removed": []})[kind].append(day)
+    # A postponed game shows up as a removed and an added date for a team
+    for team, moved in sorted(by_team.items()):
+        if moved["added"] and moved["removed"]:
+            print(
+                f"  {team} moved: {', '.join(moved['removed'])} -> "
+                f"{', '.join(moved['added'])}"
+            )
+
+
+def refresh_weeks(today=None, **fetch_options):
+    """
+    Re-scrape the current and future weeks and update the weeks whose games
+    changed. season.npz is rewritten only if something changed. Returns
+    ({week: changes, or None for a newly built schedule}, failures).
+    """
+    weeks = remaining_weeks(today)
+    if not weeks:
+        print("Season is over; nothing to refresh.")
+        return {}, {}
+    print(f"Refreshing {weeks[0]}-{weeks[-1]}...")
+    refresh_start = schedule[weeks[0]][0]
+    season_table, failures = scrape_season(
+        refresh_start, schedule[weeks[-1]][1], **fetch_options
+    )
+
+    season = load_season_schedule()
+    if season is None:
+        season = SeasonSchedule.empty(list(team_id_dict))
+        season.set_games(refresh_start, season_table.to_numpy(), season_table.columns)
+        save_season(season)
+        report = {week_name: None for week_name in weeks}
+        print_change_report(report)
+        return report, failures
+
+    new_games = season_table[season.teams].to_numpy().astype(bool)
+    first_row = season.day_index(refresh_start)
+    # A failed fetch is not a cancelled season: keep stored games
+    for team in failures:
+        col = season.team_index[team]
+        new_games[:, col] = season.games[first_row : first_row + len(new_games), col]
+
+    report = {}
+    for week_name in weeks:
+        old_table = season.week_frame(week_name)
+        rows = season.periods[week_name]
+        new_table = pd.DataFrame(
+            new_games[rows.start - first_row : rows.stop - first_row],
+            index=old_table.index,
+            columns=old_table.columns,
+        )
+        changes = diff_week(old_table, new_table)
+        if changes:
+            report[week_name] = changes
+    if report:
+        season.set_games(refresh_start, new_games, season.teams)
+        save_season(season)
+    print_change_report(report)
+    return report, failures
 
 
 def main():
@@ -149,12 +319,73 @@ def main():
         "--week",
         type=str,
         required=True,
-        help="Week number (e.g., '17', 'w17', or 'all')",
+        help=(
+            "Week number (e.g., '17', 'w17'), 'all', or 'refresh' to update "
+            "only the current and future weeks"
+        ),
+    )
+    parser.add_argument(
+        "--today",
+        type=str,
+        default=None,
+        help="Date the refresh treats as today (YYYY-MM-DD, default today)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help="Team pages fetched concurrently",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=RATE_PER_HOST,
+        help="Max requests per second to nba.com (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(CACHE_DIR),
+        help="Directory of the on-disk page cache",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=MAX_AGE,
+        help="Seconds a cached page is used without revalidating it",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=MAX_BYTES / 2**20,
+        help="Evict least recently used pages beyond this size",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always download every page"
+    )
+    parser.add_argument(
+        "--record-dir",
+        type=str,
+        default=None,
+        help="Save each team page as schedule_<TEAM>.html for benchmarks",
     )
     args = parser.parse_args()
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            args.cache_dir, max_age=args.max_age, max_bytes=int(args.cache_mb * 2**20)
+        )
+    fetch_options = {
+        "max_workers": args.workers,
+        "rate": args.rate,
+        "cache": cache,
+        "record_dir": args.record_dir,
+    }
 
     if args.week.lower() == "all":
-        run_all_weeks()
+        failures = run_all_weeks(**fetch_options)
+    elif args.week.lower() == "refresh":
+        _, failures = refresh_weeks(args.today, **fetch_options)
     else:
         # Normalize input "17" -> "w17"
         week_input = args.week if args.week.startswith("w") else f"w{args.week}"
@@ -166,7 +397,11 @@ def main():
 
         print(f"Generating schedule for {week_input}...")
         start_date, end_date = schedule[week_input]
-        scrape_week(week_input, start_date, end_date)
+        _, failures = scrape_week(week_input, start_date, end_date, **fetch_options)
+
+    if failures:
+        # The schedule was written, but the listed teams have no games in it
+        sys.exit(1)
 
 
 if __name__ == "__main__":
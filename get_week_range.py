@@ -1,3 +1,7 @@
+import bisect
+import datetime
+
+import numpy as np
 import pandas as pd
 
 schedule = {
@@ -26,15 +30,108 @@ schedule = {
 }
 
 
-def find_week_range(date):
-    if type(date) == str:
-        date = pd.to_datetime(date)
-    for week, (start, end) in schedule.items():
-        if start <= date <= end:
-            return week
+# Calendar index: periods sorted by start, as day ordinals for bisect and as
+# datetime64[D] for searchsorted over whole columns
+WEEKS = sorted(schedule, key=lambda week: schedule[week][0])
+_START_ORDINALS = [schedule[week][0].toordinal() for week in WEEKS]
+_END_ORDINALS = [schedule[week][1].toordinal() for week in WEEKS]
+_START_DAYS = np.array([schedule[week][0] for week in WEEKS], dtype="datetime64[D]")
+_END_DAYS = np.array([schedule[week][1] for week in WEEKS], dtype="datetime64[D]")
+_WEEK_NAMES = np.array(WEEKS + [None], dtype=object)
+
+
+def _to_ordinal(date):
+    if isinstance(date, str):
+        try:
+            return datetime.date.fromisoformat(date[:10]).toordinal()
+        except ValueError:
+            pass
+    if not isinstance(date, datetime.date):
+        # Strings in other formats, np.datetime64 and other scalars
+        date = pd.Timestamp(date)
+    return date.toordinal()
+
+
+def _week_position(date):
+    """Position of date's period in WEEKS, or None."""
+    ordinal = _to_ordinal(date)
+    pos = bisect.bisect_right(_START_ORDINALS, ordinal) - 1
+    if pos >= 0 and ordinal <= _END_ORDINALS[pos]:
+        return pos
     return None
 
 
+def _is_scalar(date):
+    return isinstance(date, (str, datetime.date)) or np.ndim(date) == 0
+
+
+def _to_days(dates):
+    values = pd.to_datetime(pd.Series(dates) if isinstance(dates, list) else dates)
+    return np.asarray(values, dtype="datetime64[ns]").astype("datetime64[D]")
+
+
+def week_positions(dates):
+    """
+    Positions in WEEKS of an array or Series of dates, -1 outside the
+    season; one searchsorted for the whole column.
+    """
+    days = _to_days(dates)
+    pos = np.searchsorted(_START_DAYS, days, side="right") - 1
+    inside = (pos >= 0) & (days <= _END_DAYS[pos.clip(0)])
+    return np.where(inside, pos, -1)
+
+
+def _like_input(dates, values):
+    if isinstance(dates, pd.Series):
+        return pd.Series(values, index=dates.index, name=dates.name, dtype=values.dtype)
+    return values
+
+
+def find_week_range(date):
+    """
+    Period name ('w17') of a date, or None outside the season. Given an
+    array or Series of dates, returns the names for all of them at once.
+    """
+    if _is_scalar(date):
+        pos = _week_position(date)
+        return WEEKS[pos] if pos is not None else None
+    return _like_input(date, _WEEK_NAMES[week_positions(date)])
+
+
 def get_start_end_date(date):
-    week = find_week_range(date)
-    return schedule[week]
+    pos = _week_position(date)
+    return schedule[WEEKS[pos]] if pos is not None else None
+
+
+def day_of_period(date):
+    """1-based day number of date within its period (0 outside the season)."""
+    if _is_scalar(date):
+        pos = _week_position(date)
+        if pos is None:
+            return 0
+        return _to_ordinal(date) - _START_ORDINALS[pos] + 1
+    days = _to_days(date)
+    pos = week_positions(date)
+    offset = (days - _START_DAYS[pos.clip(0)]).astype("int64") + 1
+    return _like_input(date, np.where(pos >= 0, offset, 0))
+
+
+def days_remaining(date):
+    """Days left in date's period, counting date itself (0 outside the season)."""
+    if _is_scalar(date):
+        pos = _week_position(date)
+        if pos is None:
+            return 0
+        return _END_ORDINALS[pos] - _to_ordinal(date) + 1
+    days = _to_days(date)
+    pos = week_positions(date)
+    left = (_END_DAYS[pos.clip(0)] - days).astype("int64") + 1
+    return _like_input(date, np.where(pos >= 0, left, 0))
+
+
+def remaining_weeks(date=None):
+    """Weeks that end on or after date (default today), in season order."""
+    if date is None:
+        date = pd.Timestamp.today().normalize()
+    first = bisect.bisect_left(_END_ORDINALS, _to_ordinal(date))
+    return WEEKS[first:]
@@ -0,0 +1,582 @@
+"""
+Columnar store for daily stats snapshots.
+
+Every stored crawl is one Parquet file partitioned by data type and date:
+    history_store/data_type=1/date=20260131/part-0.parquet
+Consecutive days differ in a few dozen players, so most partitions are row
+level deltas (added / changed / removed players, keyed by normalized name)
+against the previous stored day, with a full keyframe written periodically.
+Reads go through a single pyarrow dataset scan over the partitions a query
+needs, reading only the requested columns with player filters pushed down.
+A date is rebuilt from its keyframe and delta chain by resolving, per row,
+the last write along the chain with array operations.
+
+_manifest.json records, per data type and date, the content hash and how
+the day is stored: a keyframe, a delta on a base date, or a reference to an
+identical earlier snapshot (nothing written).
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from player_names import PLAYER_KEY, normalize_name, normalize_names
+from snapshot_publish import atomic_write
+from snapshot_schema import STAT_COLUMNS, STAT_DECIMALS
+
+STORE_DIR = Path(__file__).resolve().parent / "history_store"
+LEGACY_DIR = Path(__file__).resolve().parent / "history_data"
+
+DATA_COLUMNS = ["PLAYER", "TEAM", PLAYER_KEY] + STAT_COLUMNS
+PARTITIONING = ds.partitioning(
+    pa.schema([("data_type", pa.int16()), ("date", pa.string())]), flavor="hive"
+)
+LEGACY_FILE_PATTERN = re.compile(r"^(\d{8})_(\d+)\.pkl$")
+# Leading underscore keeps pyarrow from treating it as a data file
+MANIFEST_NAME = "_manifest.json"
+
+# Row operation of a stored row; keyframes only hold "key" rows
+OP_COLUMN = "_op"
+# Occurrence number of a repeated player key (the site lists some twice)
+DUP_COLUMN = "_dup"
+# Index levels of a keyed table: (player key, occurrence)
+ROW_KEY = ["_key", DUP_COLUMN]
+
+STORE_SCHEMA = pa.schema(
+    [(col, pa.string()) for col in ["PLAYER", "TEAM", PLAYER_KEY]]
+    + [(col, pa.float64()) for col in STAT_COLUMNS]
+    + [(DUP_COLUMN, pa.int16()), (OP_COLUMN, pa.string())]
+)
+
+# Write a keyframe after this many chained deltas ...
+KEYFRAME_INTERVAL = 14
+# ... or when a delta would touch more than this share of the table
+KEYFRAME_MAX_CHANGE = 0.5
+
+
+def _conform(history_data):
+    """Give every snapshot the same column set and dtypes."""
+    df = history_data.copy()
+    if PLAYER_KEY not in df.columns:
+        df[PLAYER_KEY] = normalize_names(df["PLAYER"])
+    for col in STAT_COLUMNS:
+        # Rounding drops float32 noise so snapshots compare equal across dtypes
+        df[col] = (
+            pd.to_numeric(df[col], errors="coerce")
+            .astype("float64")
+            .round(STAT_DECIMALS)
+        )
+    df["PLAYER"] = df["PLAYER"].astype(str)
+    df["TEAM"] = df["TEAM"].astype(str)
+    return df[DATA_COLUMNS].reset_index(drop=True)
+
+
+def _index_rows(df):
+    """Index stored rows by (player key, occurrence), dropping _dup."""
+    index = pd.MultiIndex.from_arrays(
+        [df[PLAYER_KEY].to_numpy(), df[DUP_COLUMN].astype("int16").to_numpy()],
+        names=ROW_KEY,
+    )
+    return df.drop(columns=[DUP_COLUMN]).set_axis(index, axis=0)
+
+
+def _keyed(history_data):
+    """Conformed table indexed by (player key, occurrence)."""
+    df = _conform(history_data)
+    df[DUP_COLUMN] = df.groupby(PLAYER_KEY).cumcount()
+    return _index_rows(df)
+
+
+def _check_date(date):
+    date = str(date)
+    pd.to_datetime(date, format="%Y%m%d")  # raises on anything else
+    return date
+
+
+def partition_path(date, data_type, root=STORE_DIR):
+    return Path(root) / f"data_type={data_type}" / f"date={date}" / "part-0.parquet"
+
+
+def _write_partition(rows, date, data_type, root):
+    """rows: keyed frame with an _op column."""
+    path = partition_path(date, int(data_type), root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = rows.assign(**{DUP_COLUMN: rows.index.get_level_values(DUP_COLUMN)})
+    rows = rows.reset_index(drop=True)[STORE_SCHEMA.names]
+    # Most partitions are a few rows, so skip the pandas metadata and keep
+    # statistics only where they help filter pushdown
+    table = pa.Table.from_pandas(rows, schema=STORE_SCHEMA, preserve_index=False)
+    # Written to a temp file and renamed, so an interrupted write never
+    # leaves a truncated partition behind
+    atomic_write(
+        path,
+        lambda f: pq.write_table(
+            table.replace_schema_metadata(None),
+            f,
+            write_statistics=[PLAYER_KEY, "TEAM"],
+        ),
+    )
+    return path
+
+
+def content_hash(history_data):
+    """Hash of the table's content, independent of row order and dtypes."""
+    df = _conform(history_data).sort_values([PLAYER_KEY, "TEAM"], kind="stable")
+    payload = df.to_csv(index=False, float_format="%.6g").encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _empty_delta():
+    return pd.DataFrame(
+        columns=DATA_COLUMNS + [OP_COLUMN],
+        index=pd.MultiIndex.from_arrays([[], []], names=ROW_KEY),
+    )
+
+
+def diff_snapshots(old, new):
+    """
+    Row level difference between two keyed snapshots. Returns a keyed frame
+    of the rows in `new` that were added or changed plus the removed keys,
+    with the operation in the _op column.
+    """
+    removed = old.index.difference(new.index, sort=False)
+    added = new.index.difference(old.index, sort=False)
+    common = new.index.intersection(old.index, sort=False)
+
+    before = old.loc[common, DATA_COLUMNS]
+    after = new.loc[common, DATA_COLUMNS]
+    same = (before == after) | (before.isna() & after.isna())
+    changed = common[~same.all(axis=1).to_numpy()]
+
+    removed_rows = pd.DataFrame(index=removed, columns=DATA_COLUMNS)
+    removed_rows[PLAYER_KEY] = removed.get_level_values("_key")
+    return pd.concat(
+        [
+            _empty_delta(),
+            new.loc[added, DATA_COLUMNS].assign(**{OP_COLUMN: "add"}),
+            new.loc[changed, DATA_COLUMNS].assign(**{OP_COLUMN: "change"}),
+            removed_rows.assign(**{OP_COLUMN: "remove"}),
+        ]
+    )
+
+
+def load_manifest(root=STORE_DIR):
+    path = Path(root) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, root=STORE_DIR):
+    payload = json.dumps(manifest, indent=1, sort_keys=True) + "\n"
+    atomic_write(Path(root) / MANIFEST_NAME, lambda f: f.write(payload), mode="w")
+
+
+def _manifest_entry(manifest, data_type):
+    return manifest.setdefault(str(data_type), {"latest": None, "snapshots": {}})
+
+
+def _stored_date(snapshots, date):
+    """Follow a reference to the date whose partition holds the data."""
+    return snapshots[date]["ref"] or date
+
+
+def _chain(snapshots, date):
+    """Stored dates needed to rebuild `date`, keyframe first."""
+    chain = [_stored_date(snapshots, date)]
+    while snapshots[chain[-1]]["kind"] == "delta":
+        chain.append(snapshots[chain[-1]]["base"])
+    return chain[::-1]
+
+
+class _ScannedRows:
+    """
+    Rows of the partition files a query needs, read in one dataset scan,
+    with the positions of every partition's rows and an integer id per
+    (player key, occurrence) so delta chains resolve with array operations.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.partitions = {
+            (int(data_type), date): positions
+            for (data_type, date), positions in df.groupby(
+                ["data_type", "date"], sort=False
+            ).indices.items()
+        }
+        codes = pd.factorize(df[PLAYER_KEY])[0]
+        dup = df[DUP_COLUMN].to_numpy(dtype="int64")
+        width = int(dup.max()) + 1 if len(dup) else 1
+        self.row_ids = codes * width + dup
+        self.ops = df[OP_COLUMN].to_numpy()
+
+    def partition(self, data_type, date):
+        return self.partitions.get((int(data_type), date), np.empty(0, dtype="intp"))
+
+    def rebuild(self, snapshots, date, data_type):
+        """
+        Positions of the rows `date` rebuilds to, in table order. Along the
+        chain (keyframe first) the last write of a row wins; a row is live
+        when it was keyed or added after its last removal, and it sits where
+        it was last keyed or added, so changed rows keep their place and new
+        players go to the end.
+        """
+        positions = np.concatenate(
+            [self.partition(data_type, s) for s in _chain(snapshots, date)]
+        )
+        row_ids = self.row_ids[positions]
+        ops = self.ops[positions]
+        order = np.arange(len(positions))
+        size = int(row_ids.max()) + 1 if len(row_ids) else 0
+
+        def last(mask):
+            latest = np.full(size, -1)
+            np.maximum.at(latest, row_ids[mask], order[mask])
+            return latest
+
+        placed = last((ops == "key") | (ops == "add"))
+        removed = last(ops == "remove")
+        written = last(ops != "remove")
+        live = np.flatnonzero(placed > removed)
+        live = live[np.argsort(placed[live], kind="stable")]
+        return positions[written[live]]
+
+    def table(self, positions):
+        """Keyed frame (with _op) of the given rows."""
+        return _index_rows(self.df.take(positions))
+
+
+def _scan(wanted, players=None, columns=None, root=STORE_DIR):
+    """
+    One scan over the needed partition files. wanted: {data_type: set of
+    stored dates}; columns: data columns to read besides the row key and
+    _op (all by default). Returns _ScannedRows, or None if nothing is
+    stored.
+    """
+    # The manifest already names the files, so skip directory discovery
+    paths = [
+        str(partition_path(date, int(data_type), root))
+        for data_type, dates in wanted.items()
+        for date in sorted(dates)
+    ]
+    if not paths:
+        return None
+    dataset = ds.dataset(
+        paths,
+        format="parquet",
+        partitioning=PARTITIONING,
+        partition_base_dir=str(root),
+    )
+    expr = None
+    if players is not None:
+        expr = ds.field(PLAYER_KEY).isin([normalize_name(p) for p in players])
+    if columns is not None:
+        columns = ["data_type", "date", PLAYER_KEY, DUP_COLUMN, OP_COLUMN] + [
+            c for c in DATA_COLUMNS if c in columns and c != PLAYER_KEY
+        ]
+    return _ScannedRows(dataset.to_table(columns=columns, filter=expr).to_pandas())
+
+
+def _as_float(df):
+    """Stat columns as float64 (astype copies even when nothing changes)."""
+    cast = {
+        col: "float64"
+        for col in STAT_COLUMNS
+        if col in df.columns and df[col].dtype != "float64"
+    }
+    return df.astype(cast) if cast else df
+
+
+def _rebuild(snapshots, date, data_type, root=STORE_DIR):
+    """Keyed table of `date` from its keyframe and delta chain."""
+    rows = _scan({data_type: set(_chain(snapshots, date))}, root=root)
+    return rows.table(rows.rebuild(snapshots, date, data_type))[DATA_COLUMNS]
+
+
+def record_snapshot(history_data, date, data_type, root=STORE_DIR):
+    """
+    Add one crawl to the store. A crawl identical to the latest snapshot of
+    its data type only gets a reference in the manifest; otherwise a delta
+    against the previous stored day is written (a same-day re-crawl replaces
+    the day), or a keyframe when the chain is long, the delta is large or
+    the date is before the latest one. Returns True when new data was
+    written.
+    """
+    date = _check_date(date)
+    new = _keyed(history_data)
+    digest = content_hash(history_data)
+    manifest = load_manifest(root)
+    entry = _manifest_entry(manifest, data_type)
+    snapshots = entry["snapshots"]
+    latest = entry["latest"]
+
+    if latest is not None and latest["hash"] == digest and latest["date"] == date:
+        return False
+
+    # Checked before the reference branch: a delta base or reference target
+    # must keep its stored data, whatever the new content is
+    if any(s.get("base") == date or s["ref"] == date for s in snapshots.values()):
+        raise ValueError(f"{date}_{data_type} is the base of later snapshots")
+
+    if latest is not None and latest["hash"] == digest:
+        previous = snapshots.get(date)
+        snapshots[date] = {"hash": digest, "ref": latest["date"]}
+        save_manifest(manifest, root)
+        if previous is not None and not previous["ref"]:
+            # Nothing depends on the replaced partition any more
+            partition_path(date, int(data_type), root).unlink(missing_ok=True)
+        return False
+
+    previous = snapshots.pop(date, None)
+    if previous is not None and not previous["ref"]:
+        # Forget the day before its partition is replaced, so the manifest
+        # never describes a file that was rewritten as something else
+        if latest["date"] == date:
+            entry["latest"] = None
+            if snapshots:
+                last = max(snapshots)
+                entry["latest"] = {"date": last, "hash": snapshots[last]["hash"]}
+        save_manifest(manifest, root)
+
+    snapshot = {"hash": digest, "ref": None, "kind": "key", "base": None, "depth": 0}
+    rows = new.assign(**{OP_COLUMN: "key"})
+    earlier = [d for d in snapshots if d < date]
+    if latest is not None and date >= latest["date"] and earlier:
+        base = _stored_date(snapshots, max(earlier))
+        if snapshots[base]["depth"] < KEYFRAME_INTERVAL:
+            old = _rebuild(snapshots, base, data_type, root)
+            delta = diff_snapshots(old, new)
+            if len(delta) <= KEYFRAME_MAX_CHANGE * len(new):
+                rows = delta
+                snapshot.update(
+                    kind="delta", base=base, depth=snapshots[base]["depth"] + 1
+                )
+
+    _write_partition(rows, date, data_type, root)
+    snapshots[date] = snapshot
+    if latest is None or date >= latest["date"]:
+        entry["latest"] = {"date": date, "hash": digest}
+    save_manifest(manifest, root)
+    return True
+
+
+def list_snapshots(root=STORE_DIR):
+    """
+    Return (date, data_type) pairs available in the store, newest first,
+    including dates kept as references.
+    """
+    snapshots = [
+        (date, int(data_type))
+        for data_type, entry in load_manifest(root).items()
+        for date in entry["snapshots"]
+    ]
+    return sorted(snapshots, reverse=True)
+
+
+def read_history(
+    data_types=None,
+    players=None,
+    teams=None,
+    start=None,
+    end=None,
+    columns=None,
+    root=STORE_DIR,
+):
+    """
+    Rebuild every snapshot in the range with one scan and return them as a
+    DataFrame with `date` and `data_type` columns. start/end are inclusive
+    and accept anything pd.to_datetime does; players are matched on their
+    normalized name.
+    """
+    manifest = load_manifest(root)
+    start = None if start is None else pd.to_datetime(start).strftime("%Y%m%d")
+    end = None if end is None else pd.to_datetime(end).strftime("%Y%m%d")
+    if data_types is not None:
+        data_types = {int(t) for t in data_types}
+
+    requested = {}
+    wanted = {}
+    for data_type, entry in manifest.items():
+        if data_types is not None and int(data_type) not in data_types:
+            continue
+        snapshots = entry["snapshots"]
+        dates = sorted(
+            d
+            for d in snapshots
+            if (start is None or d >= start) and (end is None or d <= end)
+        )
+        if dates:
+            requested[data_type] = dates
+            wanted[data_type] = {s for d in dates for s in _chain(snapshots, d)}
+
+    # Only the requested columns are read; TEAM too when filtering on it
+    read_columns = None
+    if columns is not None:
+        read_columns = list(columns) + (["TEAM"] if teams is not None else [])
+    rows = _scan(wanted, players, read_columns, root)
+
+    # Rebuilt in (date, data_type) order, so the result needs no sort
+    queries = sorted(
+        (date, data_type) for data_type, dates in requested.items() for date in dates
+    )
+    positions = [
+        rows.rebuild(manifest[data_type]["snapshots"], date, data_type)
+        for date, data_type in queries
+    ]
+    if not positions:
+        return pd.DataFrame(columns=["date", "data_type"] + DATA_COLUMNS)
+
+    counts = [len(p) for p in positions]
+    data_columns = [c for c in DATA_COLUMNS if c in rows.df.columns]
+    df = rows.df.take(np.concatenate(positions))[data_columns].reset_index(drop=True)
+    query_dates = pd.to_datetime([date for date, _ in queries], format="%Y%m%d")
+    df.insert(0, "date", query_dates.repeat(counts))
+    df.insert(1, "data_type", np.repeat([int(t) for _, t in queries], counts))
+    df = _as_float(df)
+    if teams is not None:
+        df = df[df["TEAM"].isin(list(teams))].reset_index(drop=True)
+    if columns is not None:
+        df = df[["date", "data_type"] + [c for c in columns if c in DATA_COLUMNS]]
+    return df
+
+
+def read_snapshot(date, data_type, root=STORE_DIR):
+    """
+    One day's table with the crawler's columns. Rows follow the keyframe
+    order, with players added since then at the end.
+    """
+    date = _check_date(date)
+    snapshots = load_manifest(root).get(str(data_type), {}).get("snapshots", {})
+    if date not in snapshots:
+        return pd.DataFrame(columns=DATA_COLUMNS)
+    rows = _scan({data_type: set(_chain(snapshots, date))}, root=root)
+    df = rows.df.take(rows.rebuild(snapshots, date, data_type))[DATA_COLUMNS]
+    return _as_float(df.reset_index(drop=True))
+
+
+def read_changes(date, data_type, since=None, root=STORE_DIR):
+    """
+    Players added, changed or removed between `since` (default: the
+    previous snapshot) and `date`. Returns the new rows with an _op column;
+    removed players only carry their key.
+    """
+    date = _check_date(date)
+    snapshots = load_manifest(root)[str(data_type)]["snapshots"]
+    if since is None:
+        earlier = [d for d in sorted(snapshots) if d < date]
+        if not earlier:
+            raise ValueError(f"no snapshot before {date}_{data_type}")
+        since = earlier[-1]
+    since = _check_date(since)
+
+    stored = _stored_date(snapshots, date)
+    stored_since = _stored_date(snapshots, since)
+    if stored == stored_since:
+        delta = _empty_delta()
+    elif snapshots[stored].get("base") == stored_since:
+        # The stored delta already is the answer
+        rows = _scan({data_type: {stored}}, root=root)
+        delta = rows.table(rows.partition(data_type, stored))
+    else:
+        rows = _scan(
+            {data_type: set(_chain(snapshots, date)) | set(_chain(snapshots, since))},
+            root=root,
+        )
+        old = rows.table(rows.rebuild(snapshots, since, data_type))[DATA_COLUMNS]
+        new = rows.table(rows.rebuild(snapshots, date, data_type))[DATA_COLUMNS]
+        delta = diff_snapshots(old, new)
+    return delta.reset_index(drop=True)[DATA_COLUMNS + [OP_COLUMN]]
+
+
+def reencode_store(root=STORE_DIR):
+    """
+    Rewrite the whole store in date order through record_snapshot, so every
+    day is stored as a keyframe, delta or reference under the current rules.
+    """
+    root = Path(root)
+    manifest = load_manifest(root)
+    tables = []
+    for date, data_type in sorted(list_snapshots(root)):
+        snapshots = manifest[str(data_type)]["snapshots"]
+        stored = _stored_date(snapshots, date)
+        if "kind" in snapshots[stored]:
+            table = read_snapshot(date, data_type, root)
+        else:
+            # Written before delta encoding: the partition is a full table
+            table = pd.read_parquet(partition_path(stored, data_type, root))
+        tables.append((date, data_type, table))
+
+    tmp_root = Path(tempfile.mkdtemp(prefix="history_store_", dir=root.parent))
+    for date, data_type, table in tables:
+        record_snapshot(table, date, data_type, tmp_root)
+    shutil.rmtree(root)
+    tmp_root.rename(root)
+    return load_manifest(root)
+
+
+def migrate_legacy_files(legacy_dir=LEGACY_DIR, root=STORE_DIR, remove=False):
+    """One-shot import of history_data/YYYYMMDD_T.pkl (+ .csv) into the store."""
+    legacy = []
+    for path in Path(legacy_dir).glob("*.pkl"):
+        match = LEGACY_FILE_PATTERN.match(path.name)
+        if match:  # current_{T}.pkl stays where the app reads it
+            legacy.append((match.group(1), int(match.group(2)), path))
+
+    migrated = []
+    for date, data_type, path in sorted(legacy):
+        record_snapshot(pd.read_pickle(path), date, data_type, root)
+        migrated.append(path)
+        if remove:
+            path.unlink()
+            path.with_suffix(".csv").unlink(missing_ok=True)
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the history data store.")
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="import the per-day history_data/*.pkl files into the store",
+    )
+    parser.add_argument(
+        "--remove-legacy",
+        action="store_true",
+        help="delete the per-day pkl/csv files after importing them",
+    )
+    parser.add_argument(
+        "--reencode",
+        action="store_true",
+        help="rewrite the store as keyframes, deltas and references",
+    )
+    args = parser.parse_args()
+
+    if args.migrate:
+        migrated = migrate_legacy_files(remove=args.remove_legacy)
+        print(f"Migrated {len(migrated)} snapshots into {STORE_DIR}")
+    if args.reencode:
+        manifest = reencode_store()
+        kinds = {}
+        for entry in manifest.values():
+            for snapshot in entry["snapshots"].values():
+                kind = "ref" if snapshot["ref"] else snapshot["kind"]
+                kinds[kind] = kinds.get(kind, 0) + 1
+        print(f"Re-encoded {STORE_DIR}: {kinds}")
+    if not (args.migrate or args.reencode):
+        for date, data_type in list_snapshots():
+            print(f"{date}_{data_type}")
+
+
+if __name__ == "__main__":
+    main()
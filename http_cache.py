@@ -0,0 +1,143 @@
+"""
+Persistent HTTP response cache with conditional revalidation.
+
+Each cached URL is two files named by the URL's sha256: the raw body and a
+JSON sidecar with the ETag / Last-Modified validators, the fetch time and
+an optional parsed result. Within max_age a cached page is served without
+any request; after that it is revalidated with If-None-Match /
+If-Modified-Since, and a 304 reuses both the body and the parsed result.
+When the cache grows past max_bytes the least recently used entries are
+removed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / ".http_cache"
+MAX_AGE = 6 * 3600
+MAX_BYTES = 50 * 1024 * 1024
+
+FETCHED = "fetched"
+FRESH = "fresh"
+REVALIDATED = "revalidated"
+
+
+class CachedPage:
+    """A page body served through the cache and how it was obtained."""
+
+    def __init__(self, url, content, meta, source):
+        self.url = url
+        self.content = content
+        self.meta = meta
+        self.source = source
+        self.status_code = 200
+
+    @property
+    def reused(self):
+        """True if the body did not change since it was last parsed."""
+        return self.source != FETCHED
+
+    @property
+    def parsed(self):
+        return self.meta.get("parsed") if self.reused else None
+
+
+class ResponseCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_age=MAX_AGE, max_bytes=MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        stem = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{stem}.body", self.cache_dir / f"{stem}.json"
+
+    def _write_meta(self, meta_path, meta):
+        tmp = meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, meta_path)
+
+    def lookup(self, url):
+        """Return the cached entry as (meta, body) or None."""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    def is_fresh(self, meta):
+        return time.time() - meta["fetched_at"] < self.max_age
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def serve(self, url, meta, body, source):
+        """Hand out a cached body; revalidation restarts its max age."""
+        if source == REVALIDATED:
+            meta["fetched_at"] = time.time()
+            self._write_meta(self._paths(url)[1], meta)
+        else:
+            # Bump mtime so eviction sees the entry as recently used
+            self._paths(url)[1].touch()
+        return CachedPage(url, body, meta, source)
+
+    def store(self, url, response):
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        tmp = body_path.with_suffix(".body.tmp")
+        tmp.write_bytes(response.content)
+        os.replace(tmp, body_path)
+        self._write_meta(meta_path, meta)
+        self.evict()
+        return CachedPage(url, response.content, meta, FETCHED)
+
+    def save_parsed(self, page, parsed):
+        """Attach a JSON-serializable parse result so a 304 can skip parsing."""
+        page.meta["parsed"] = parsed
+        self._write_meta(self._paths(page.url)[1], page.meta)
+
+    def discard(self, url):
+        """Forget a cached page, e.g. one whose body could not be parsed."""
+        for path in self._paths(url):
+            path.unlink(missing_ok=True)
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        with self.lock:
+            entries = []
+            total = 0
+            for meta_path in self.cache_dir.glob("*.json"):
+                body_path = meta_path.with_suffix(".body")
+                try:
+                    size = meta_path.stat().st_size + body_path.stat().st_size
+                    used = meta_path.stat().st_mtime
+                except OSError:
+                    continue
+                entries.append((used, size, meta_path, body_path))
+                total += size
+            for _, size, meta_path, body_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for path in (meta_path, body_path):
+                    path.unlink(missing_ok=True)
+                total -= size
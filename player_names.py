@@ -0,0 +1,35 @@
+from functools import lru_cache
+
+import pandas as pd
+from unidecode import unidecode  # type: ignore
+
+# Column holding the normalized lookup key in stats snapshots
+PLAYER_KEY = "PLAYER_KEY"
+
+
+@lru_cache(maxsize=None)
+def transliterate_name(name):
+    """ASCII form of a player name, e.g. 'Nikola Jokić' -> 'Nikola Jokic'."""
+    return unidecode(name)
+
+
+@lru_cache(maxsize=None)
+def normalize_name(name):
+    """Lookup key for a player name: transliterated, lower case, stripped."""
+    return transliterate_name(name).lower().strip()
+
+
+def _map_unique(names, func):
+    # Players repeat across snapshots and lookups, so only distinct names
+    # go through the cached function and the result is mapped back at once.
+    names = pd.Series(names)
+    mapping = {name: func(name) for name in pd.unique(names)}
+    return names.map(mapping)
+
+
+def transliterate_names(names):
+    return _map_unique(names, transliterate_name)
+
+
+def normalize_names(names):
+    return _map_unique(names, normalize_name)
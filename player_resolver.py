@@ -0,0 +1,187 @@
+"""
+Resolve ESPN roster names to stats snapshot player keys.
+
+A PlayerResolver is built once per stats map (one snapshot version) and
+tries, in order:
+    exact      normalized name (after the manual NAME_MAPPING) is a key
+    canonical  same name without punctuation and suffixes (Jr., II), with
+               common nicknames expanded ("Nic" -> "nicolas")
+    initial    "J. Smith" style names (a lone first initial): same last
+               name and first initial, if that is unique
+    fuzzy      best trigram match over canonical names; the first names
+               must be as similar as the full names, so a shared last name
+               alone ("Bojan" vs "Bogdan Bogdanovic") does not match
+Every tier but exact has a confidence score and only counts at or above
+min_score. Results are memoized per ESPN player id (or name). Names that do
+not resolve are kept in `misses` with their best candidate, and names that
+resolved by a non-exact tier in `approximate`, so both can be reported
+instead of silently projecting zero or another player's line.
+"""
+
+import re
+import threading
+from collections import defaultdict
+
+from player_names import normalize_name
+
+# Manual name mappings
+NAME_MAPPING = {
+    "Alex Sarr": "Alexandre Sarr",
+    "Nic Claxton": "Nicolas Claxton",
+    "GG Jackson": "GG Jackson II",
+}
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+NICKNAMES = {
+    "alex": "alexandre",
+    "cam": "cameron",
+    "herb": "herbert",
+    "nic": "nicolas",
+    "nick": "nicolas",
+    "ron": "ronald",
+}
+MIN_FUZZY_SCORE = 0.75
+CANONICAL_SCORE = 0.95
+INITIAL_SCORE = 0.85
+
+_PUNCTUATION = re.compile(r"[.'’`]")
+_SEPARATORS = re.compile(r"[-\s]+")
+_LONE_INITIAL = re.compile(r"^[a-z]\.?$")
+
+
+def lookup_key(player_name):
+    """Exact lookup key of a roster name: manual mapping, then normalized."""
+    name = player_name.strip()
+    return normalize_name(NAME_MAPPING.get(name, name))
+
+
+def canonical_name(key):
+    """'P.J. Washington Jr.' style variants -> 'pj washington'."""
+    tokens = _SEPARATORS.split(_PUNCTUATION.sub("", key).strip())
+    tokens = [t for t in tokens if t and t not in SUFFIXES]
+    if not tokens:
+        return ""
+    tokens[0] = NICKNAMES.get(tokens[0], tokens[0])
+    return " ".join(tokens)
+
+
+def _initial_key(canonical):
+    tokens = canonical.split()
+    if len(tokens) < 2:
+        return None
+    return tokens[0][0], " ".join(tokens[1:])
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class Resolution:
+    """
+    Outcome of resolving one name: the stats key (None on a miss), the
+    method that matched, its score, and on a miss the closest candidate.
+    """
+
+    def __init__(self, key, method, score=1.0, candidate=None):
+        self.key = key
+        self.method = method
+        self.score = score
+        self.candidate = candidate
+
+    def __repr__(self):
+        return f"Resolution({self.key!r}, {self.method!r}, {self.score:.2f})"
+
+
+class PlayerResolver:
+    def __init__(self, keys, min_score=MIN_FUZZY_SCORE):
+        self.min_score = min_score
+        self.keys = set(keys)
+        self._canonical = defaultdict(list)
+        self._initial = defaultdict(list)
+        self._trigrams = defaultdict(set)
+        self._gram_count = {}
+        self._first_grams = {}
+        for key in self.keys:
+            canonical = canonical_name(key)
+            self._canonical[canonical].append(key)
+            initial = _initial_key(canonical)
+            if initial:
+                self._initial[initial].append(key)
+            grams = trigrams(canonical)
+            self._gram_count[key] = len(grams)
+            self._first_grams[key] = trigrams(canonical.split(" ")[0])
+            for gram in grams:
+                self._trigrams[gram].add(key)
+        self._memo = {}
+        self._lock = threading.Lock()
+        # roster name -> Resolution of names that did not resolve
+        self.misses = {}
+        # roster name -> Resolution of names matched by a non-exact tier
+        self.approximate = {}
+
+    def _fuzzy(self, canonical):
+        grams = trigrams(canonical)
+        first = trigrams(canonical.split(" ")[0])
+        shared = defaultdict(int)
+        for gram in grams:
+            for key in self._trigrams.get(gram, ()):
+                shared[key] += 1
+        best_key, best_score = None, 0.0
+        for key, count in shared.items():
+            # Dice coefficient over trigram sets, of the full and first names
+            score = 2 * count / (len(grams) + self._gram_count[key])
+            if score <= best_score:
+                continue
+            first_key = self._first_grams[key]
+            score = min(
+                score, 2 * len(first & first_key) / (len(first) + len(first_key))
+            )
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+    def _resolve(self, player_name):
+        key = lookup_key(player_name)
+        if key in self.keys:
+            return Resolution(key, "exact")
+        canonical = canonical_name(key)
+        matches = self._canonical.get(canonical, [])
+        if len(matches) == 1 and CANONICAL_SCORE >= self.min_score:
+            return Resolution(matches[0], "canonical", CANONICAL_SCORE)
+        # Only a name written with a lone initial ("J. Smith") may match any
+        # first name with that initial; "Marcus Morris" must not match
+        # "Monte Morris" just because the pair is unique
+        first = _SEPARATORS.split(key.strip())[0]
+        initial = _initial_key(canonical) if _LONE_INITIAL.match(first) else None
+        matches = self._initial.get(initial, []) if initial else []
+        if len(matches) == 1 and INITIAL_SCORE >= self.min_score:
+            return Resolution(matches[0], "initial", INITIAL_SCORE)
+        best_key, score = self._fuzzy(canonical)
+        if best_key is not None and score >= self.min_score:
+            return Resolution(best_key, "fuzzy", score)
+        return Resolution(None, None, score, candidate=best_key)
+
+    def resolve(self, player_name, espn_id=None):
+        """Resolution of a roster name; memoized per ESPN id (or name)."""
+        memo_key = espn_id if espn_id is not None else player_name
+        with self._lock:
+            cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+        result = self._resolve(player_name)
+        with self._lock:
+            if result.key is None:
+                self.misses[player_name] = result
+            elif result.method != "exact":
+                self.approximate[player_name] = result
+            self._memo[memo_key] = result
+        return result
+
+    def resolve_key(self, player_name, espn_id=None):
+        return self.resolve(player_name, espn_id).key
+
+    def snapshot(self):
+        """Copies of (misses, approximate), safe while other sessions resolve."""
+        with self._lock:
+            return dict(self.misses), dict(self.approximate)
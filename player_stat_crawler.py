@@ -1,17 +1,29 @@
 import argparse
 import json
 import os
+import sys
 import time
+from datetime import datetime
+from html.parser import HTMLParser
 from pathlib import Path
 
 import pandas as pd
+import requests
 from selenium import webdriver  # type: ignore
+from selenium.common.exceptions import (  # type: ignore
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.chrome.options import Options  # type: ignore
 from selenium.webdriver.common.by import By  # type: ignore
 from selenium.webdriver.support import expected_conditions as EC  # type: ignore
 from selenium.webdriver.support.ui import Select  # type: ignore
 from selenium.webdriver.support.ui import WebDriverWait  # type: ignore
-from unidecode import unidecode  # type: ignore
+
+from history_store import content_hash, record_snapshot
+from player_names import PLAYER_KEY, normalize_names, transliterate_names
+from snapshot_publish import publish_current
+from snapshot_schema import STAT_COLUMNS, enforce_schema
 
 
 def parse_arguments():
@@ -26,13 +38,71 @@ def parse_arguments():
     )
 
     parser.add_argument(
-        "-d", "--date", type=str, default=20260000, help="date in format like 20260101"
+        "--data-types",
+        type=str,
+        default=None,
+        help="comma separated data types crawled in one browser session, e.g. 0,1,7,14,30 (overrides -t)",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--date",
+        type=str,
+        default=datetime.now().strftime("%Y%m%d"),
+        help="date in format like 20260101 (default: today)",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=["selenium", "http", "replay"],
+        default="selenium",
+        help=(
+            "selenium drives headless Chrome, http posts the ASP.NET form directly, "
+            "replay reads saved fixtures from --fixture-dir"
+        ),
+    )
+
+    parser.add_argument(
+        "--fixture-dir",
+        type=str,
+        default="benchmarks/fixtures",
+        help=(
+            "directory of rankings_{data type}.html fixtures "
+            "(default: benchmarks/fixtures)"
+        ),
+    )
+
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="save the raw rankings table HTML of each data type to --fixture-dir",
+    )
+
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="parse and format the tables without writing history_data",
+    )
+
+    parser.add_argument(
+        "--wait-timeout",
+        type=float,
+        default=30,
+        help="max seconds to wait for the page, a postback or a request (default: 30)",
+    )
+
+    parser.add_argument(
+        "--legacy-extract",
+        action="store_true",
+        help="read the table cell by cell through WebDriver (slow, for timing comparison)",
     )
 
     return parser.parse_args()
 
 
-args = parse_arguments()
+def parse_data_types(value):
+    return [int(part) for part in value.split(",") if part.strip()]
 
 
 chrome_options = Options()
@@ -42,72 +112,442 @@ chrome_options.add_argument("--disable-dev-shm-usage")
 
 cookie_str = os.getenv("FANTASY_HASHTAG_COOKIES")
 
-# Reference data type, can be [0, 1, 7, 14, 30]
-DATA_TYPE = args.data_type
-DATE = args.date
+# Exit status when every crawled table matched its latest snapshot; only
+# the store manifest changed (references for the crawl date)
+EXIT_UNCHANGED = 3
 
+RANKINGS_URL = "https://hashtagbasketball.com/import-v2/fantasy-basketball-rankings"
+TABLE_ID = "ContentPlaceHolder1_GridView1"
+SHOW_SELECT_ID = "ContentPlaceHolder1_DDSHOW"
+SOURCE_SELECT_ID = "ContentPlaceHolder1_DDPOSFROM"
+DURATION_SELECT_ID = "ContentPlaceHolder1_DDDURATION"
 
-def get_history_data(data_type):
-    driver = webdriver.Chrome(options=chrome_options)
-    wait = WebDriverWait(driver, 10)
-    driver.get("https://hashtagbasketball.com/import-v2/fantasy-basketball-rankings")
-    try:
-        cookies = json.loads(cookie_str)
-        for cookie in cookies:
-            cookie_dict = {
-                "name": cookie["name"],
-                "value": cookie["value"],
-                "domain": cookie.get("domain"),
-                "path": cookie.get("path", "/"),
-            }
-            driver.add_cookie(cookie_dict)
+http_headers = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    )
+}
 
-        print("import cookie success")
-    except Exception as e:
-        print(f"import cookie error: {e}")
+# True once the document is loaded and no UpdatePanel postback is in flight
+PAGE_IDLE_JS = """
+if (document.readyState !== "complete") { return false; }
+if (window.Sys && Sys.WebForms && Sys.WebForms.PageRequestManager) {
+    return !Sys.WebForms.PageRequestManager.getInstance().get_isInAsyncPostBack();
+}
+return true;
+"""
 
-    time.sleep(3)
 
-    driver.get("https://hashtagbasketball.com/import-v2/fantasy-basketball-rankings")
-    select_top_element = wait.until(
-        EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_DDSHOW"))
-    )
-    select_top = Select(select_top_element)
-    select_top.select_by_visible_text("All")
+class GridViewParser(HTMLParser):
+    """
+    Collect header and cell text from the rendered GridView table HTML.
+    Mirrors the WebDriver path: every <th> is a header, every <tr> with <td>
+    cells is a data row. With table_id set, only that table of a full page is
+    read.
+    """
 
-    select_source_element = wait.until(
-        EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_DDPOSFROM"))
-    )
-    select_source = Select(select_source_element)
-    select_source.select_by_visible_text("ESPN")
+    def __init__(self, table_id=None):
+        super().__init__(convert_charrefs=True)
+        self.headers = []
+        self.rows = []
+        self._row = None
+        self._cell = None
+        self._cell_tag = None
+        self._skip_depth = 0
+        self._table_id = table_id
+        self._active = table_id is None
+        self._table_depth = 0
 
-    select_range_element = wait.until(
-        EC.presence_of_element_located((By.ID, "ContentPlaceHolder1_DDDURATION"))
-    )
-    select_range = Select(select_range_element)
-    select_range.select_by_value(str(data_type))
+    def handle_starttag(self, tag, attrs):
+        if self._table_id is not None and tag == "table":
+            if self._active:
+                self._table_depth += 1
+            elif dict(attrs).get("id") == self._table_id:
+                self._active = True
+                self._table_depth = 1
+            return
+        if not self._active:
+            return
+        if tag in ("script", "style"):
+            self._skip_depth += 1
+        elif tag == "tr":
+            self._end_row()
+            self._row = []
+        elif tag in ("td", "th"):
+            self._end_cell()
+            self._cell = []
+            self._cell_tag = tag
+        elif tag == "br" and self._cell is not None:
+            self._cell.append("\n")
 
-    time.sleep(7)
+    def handle_endtag(self, tag):
+        if not self._active:
+            return
+        if self._table_id is not None and tag == "table":
+            self._table_depth -= 1
+            if self._table_depth == 0:
+                self._end_row()
+                self._active = False
+            return
+        if tag in ("script", "style"):
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in ("td", "th"):
+            self._end_cell()
+        elif tag == "tr":
+            self._end_row()
+        elif tag == "table":
+            self._end_row()
+
+    def close(self):
+        super().close()
+        self._end_row()
+
+    def handle_data(self, data):
+        if self._cell is not None and not self._skip_depth:
+            self._cell.append(data)
+
+    def _end_cell(self):
+        if self._cell is None:
+            return
+        # Collapse whitespace like WebElement.text does, keeping <br> breaks
+        lines = "".join(self._cell).split("\n")
+        text = "\n".join(" ".join(line.split()) for line in lines).strip()
+        if self._cell_tag == "th":
+            self.headers.append(text)
+        elif self._row is not None:
+            self._row.append(text)
+        self._cell = None
+        self._cell_tag = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self._row:
+            self.rows.append(self._row)
+        self._row = None
+
+
+def parse_table_html(table_html, table_id=None):
+    """Parse GridView outerHTML into (headers, rows) in a single pass."""
+    parser = GridViewParser(table_id)
+    parser.feed(table_html)
+    parser.close()
+    return parser.headers, parser.rows
 
-    table = wait.until(
-        EC.visibility_of_element_located((By.ID, "ContentPlaceHolder1_GridView1"))
-    )
 
+def extract_table_cells(table):
+    """Legacy extraction: one WebDriver round trip per cell."""
     headers = [th.text for th in table.find_elements(By.TAG_NAME, "th")]
     rows = table.find_elements(By.TAG_NAME, "tr")
     table_data = []
     for row in rows:
         cells = row.find_elements(By.TAG_NAME, "td")
         row_data = [cell.text for cell in cells]
-        # print(row_data)
         if row_data:
             table_data.append(row_data)
+    return headers, table_data
+
+
+def build_stats_table(headers, table_data):
     stats_table = pd.DataFrame(table_data, columns=headers)
+    # The grid repeats its header row every few players
     stats_table = stats_table[stats_table["R#"] != "R#"].reset_index(drop=True)
-    driver.quit()
     return stats_table
 
 
+def load_cookies():
+    """Read the login cookies exported into FANTASY_HASHTAG_COOKIES."""
+    try:
+        cookies = [
+            {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie.get("domain"),
+                "path": cookie.get("path", "/"),
+            }
+            for cookie in json.loads(cookie_str)
+        ]
+        print("import cookie success")
+        return cookies
+    except Exception as e:
+        print(f"import cookie error: {e}")
+        return []
+
+
+def option_selected(driver, select_id, text=None, value=None):
+    """True when the (re-rendered) select reports the requested option."""
+    elements = driver.find_elements(By.ID, select_id)
+    if not elements:
+        return False
+    try:
+        selected = Select(elements[0]).first_selected_option
+        if text is not None:
+            return selected.text.strip() == text
+        return selected.get_attribute("value") == value
+    except StaleElementReferenceException:
+        return False
+
+
+def choose_option(driver, wait, select_id, text=None, value=None):
+    """
+    Pick an option in an auto-postback select and wait for the grid to re-render.
+    Returns immediately when the option is already selected, since no postback
+    fires in that case. Raises TimeoutException when the page does not come
+    back with the option selected, so a stale grid is never read as the new one.
+    """
+    select_element = wait.until(EC.presence_of_element_located((By.ID, select_id)))
+    select = Select(select_element)
+    selected = select.first_selected_option
+    if text is not None and selected.text.strip() == text:
+        return
+    if value is not None and selected.get_attribute("value") == value:
+        return
+
+    # The postback replaces the grid (or the whole page when there is none yet)
+    tables = driver.find_elements(By.ID, TABLE_ID)
+    old_element = tables[0] if tables else select_element
+
+    if text is not None:
+        select.select_by_visible_text(text)
+    else:
+        select.select_by_value(value)
+
+    try:
+        wait.until(EC.staleness_of(old_element))
+        wait.until(lambda d: d.execute_script(PAGE_IDLE_JS))
+        wait.until(lambda d: option_selected(d, select_id, text, value))
+    except TimeoutException as e:
+        raise TimeoutException(
+            f"{select_id} change to {text if text is not None else value!r} "
+            "did not re-render the grid"
+        ) from e
+
+
+def open_rankings_page(driver, wait):
+    """Log in with the stored cookies and set the table to all players / ESPN."""
+    driver.get(RANKINGS_URL)
+    for cookie_dict in load_cookies():
+        driver.add_cookie(cookie_dict)
+
+    # driver.get blocks until the logged-in page has loaded
+    driver.get(RANKINGS_URL)
+    choose_option(driver, wait, SHOW_SELECT_ID, text="All")
+    choose_option(driver, wait, SOURCE_SELECT_ID, text="ESPN")
+
+
+def select_duration(driver, wait, data_type):
+    choose_option(driver, wait, DURATION_SELECT_ID, value=str(data_type))
+
+
+def read_stats_table(wait, legacy_extract=False):
+    table = wait.until(EC.visibility_of_element_located((By.ID, TABLE_ID)))
+
+    start = time.perf_counter()
+    if legacy_extract:
+        headers, table_data = extract_table_cells(table)
+    else:
+        headers, table_data = parse_table_html(table.get_attribute("outerHTML"))
+    print(f"table extraction took {time.perf_counter() - start:.3f}s")
+
+    return build_stats_table(headers, table_data)
+
+
+def fixture_path(fixture_dir, data_type):
+    return Path(fixture_dir) / f"rankings_{data_type}.html"
+
+
+def record_fixture(fixture_dir, data_type, html):
+    path = fixture_path(fixture_dir, data_type)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(html, encoding="utf-8")
+    print(f"recorded {path}")
+
+
+def iter_history_data(
+    data_types, legacy_extract=False, wait_timeout=30, record_dir=None
+):
+    """
+    Crawl several DDDURATION ranges in one browser session.
+    Logs in once, then only switches the range select for each data type.
+    Yields (data_type, stats_table).
+    """
+    driver = webdriver.Chrome(options=chrome_options)
+    wait = WebDriverWait(driver, wait_timeout)
+    try:
+        open_rankings_page(driver, wait)
+        for data_type in data_types:
+            select_duration(driver, wait, data_type)
+            if record_dir is not None:
+                table = wait.until(EC.visibility_of_element_located((By.ID, TABLE_ID)))
+                record_fixture(record_dir, data_type, table.get_attribute("outerHTML"))
+            yield data_type, read_stats_table(wait, legacy_extract)
+    finally:
+        driver.quit()
+
+
+def get_history_data(data_type, legacy_extract=False, wait_timeout=30):
+    for _, stats_table in iter_history_data([data_type], legacy_extract, wait_timeout):
+        return stats_table
+
+
+def parse_stats_html(html):
+    """Read the GridView out of a table fragment or a full rankings page."""
+    headers, table_data = parse_table_html(html, table_id=TABLE_ID)
+    if not headers:
+        raise ValueError(f"{TABLE_ID} not found")
+    return build_stats_table(headers, table_data)
+
+
+def iter_history_data_replay(data_types, fixture_dir):
+    """Offline stand-in for the crawl: yield tables parsed from saved fixtures."""
+    for data_type in data_types:
+        html = fixture_path(fixture_dir, data_type).read_text(encoding="utf-8")
+        yield data_type, parse_stats_html(html)
+
+
+class AspNetFormParser(HTMLParser):
+    """
+    Collect what a browser would post back for the page's WebForms form:
+    named inputs (including __VIEWSTATE / __EVENTVALIDATION) and selects.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = {}
+        # select id -> {"name", "options": [(value, text)], "selected"}
+        self.selects = {}
+        self._select = None
+        self._option = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "input":
+            input_type = (attrs.get("type") or "text").lower()
+            name = attrs.get("name")
+            if not name or input_type in ("submit", "button", "image", "reset"):
+                return
+            if input_type in ("checkbox", "radio") and "checked" not in attrs:
+                return
+            self.fields[name] = attrs.get("value") or ""
+        elif tag == "select" and attrs.get("name"):
+            self._select = {"name": attrs["name"], "options": [], "selected": None}
+            self.selects[attrs.get("id") or attrs["name"]] = self._select
+        elif tag == "option" and self._select is not None:
+            self._end_option()
+            self._option = [attrs.get("value"), [], "selected" in attrs]
+
+    def handle_endtag(self, tag):
+        if tag == "option":
+            self._end_option()
+        elif tag == "select":
+            self._end_option()
+            if self._select is not None and self._select["selected"] is None:
+                options = self._select["options"]
+                self._select["selected"] = options[0][0] if options else ""
+            self._select = None
+
+    def handle_data(self, data):
+        if self._option is not None:
+            self._option[1].append(data)
+
+    def _end_option(self):
+        if self._option is None:
+            return
+        value, text, selected = self._option
+        text = " ".join("".join(text).split())
+        value = text if value is None else value
+        self._select["options"].append((value, text))
+        if selected:
+            self._select["selected"] = value
+        self._option = None
+
+
+def parse_form_state(page_html):
+    parser = AspNetFormParser()
+    parser.feed(page_html)
+    parser.close()
+    return parser
+
+
+def http_choose_option(
+    session, url, page_html, select_id, text=None, value=None, timeout=30
+):
+    """
+    Post the form back the way the select's onchange handler would.
+    Returns the new page HTML, or page_html unchanged if the option is
+    already selected.
+    """
+    form = parse_form_state(page_html)
+    if select_id not in form.selects:
+        raise ValueError(f"select {select_id} not found, check the login cookies")
+    select = form.selects[select_id]
+
+    if value is None:
+        matches = [v for v, t in select["options"] if t == text]
+        if not matches:
+            raise ValueError(f"option {text!r} not found in {select_id}")
+        value = matches[0]
+    if select["selected"] == value:
+        return page_html
+
+    data = dict(form.fields)
+    for other in form.selects.values():
+        data[other["name"]] = other["selected"]
+    data[select["name"]] = value
+    data["__EVENTTARGET"] = select["name"]
+    data["__EVENTARGUMENT"] = ""
+
+    response = session.post(url, data=data, timeout=timeout)
+    response.raise_for_status()
+
+    # A rejected postback re-renders the old range with a 200
+    posted = parse_form_state(response.text).selects.get(select_id)
+    if posted is None or posted["selected"] != value:
+        raise ValueError(f"{select_id} change to {value!r} was not applied")
+    return response.text
+
+
+def iter_history_data_http(data_types, timeout=30, url=RANKINGS_URL, record_dir=None):
+    """
+    Same as iter_history_data, but without a browser: GET the rankings page
+    and post the WebForms dropdown changes with requests, carrying the view
+    state forward between posts.
+    """
+    with requests.Session() as session:
+        session.headers.update(http_headers)
+        for cookie in load_cookies():
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"] or "",
+                path=cookie["path"],
+            )
+
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        page_html = response.text
+
+        page_html = http_choose_option(
+            session, url, page_html, SHOW_SELECT_ID, text="All", timeout=timeout
+        )
+        page_html = http_choose_option(
+            session, url, page_html, SOURCE_SELECT_ID, text="ESPN", timeout=timeout
+        )
+        for data_type in data_types:
+            page_html = http_choose_option(
+                session,
+                url,
+                page_html,
+                DURATION_SELECT_ID,
+                value=str(data_type),
+                timeout=timeout,
+            )
+            if record_dir is not None:
+                record_fixture(record_dir, data_type, page_html)
+            yield data_type, parse_stats_html(page_html)
+
+
 def format_history_data(stats_table):
     hist_scrape = stats_table[
         [
@@ -130,38 +570,57 @@ def format_history_data(stats_table):
     hist_scrape[["FTM", "FTA"]] = (
         hist_scrape["FT%"].str.extract(r"\(([\d\.]+)/([\d\.]+)\)").astype(float)
     )
-    stats_cols = [
-        "FGM",
-        "FGA",
-        "FTM",
-        "FTA",
-        "3PM",
-        "PTS",
-        "TREB",
-        "AST",
-        "STL",
-        "BLK",
-        "TO",
-    ]
-    cols = ["PLAYER", "TEAM"] + stats_cols
+    cols = ["PLAYER", "TEAM"] + STAT_COLUMNS
     history_data = hist_scrape[cols].copy()
-    history_data["PLAYER"] = history_data["PLAYER"].apply(unidecode)
-    return history_data
+    history_data["PLAYER"] = transliterate_names(history_data["PLAYER"])
+    history_data[PLAYER_KEY] = normalize_names(history_data["PLAYER"])
+    return enforce_schema(history_data)
 
 
-def store_table(history_data, pkl_file_name):
-    for file_type in ["pkl", "csv"]:
-        date_path = Path("history_data") / f"{pkl_file_name}.{file_type}"
-        current_path = Path("history_data") / f"current_{DATA_TYPE}.{file_type}"
-        if file_type == "pkl":
-            # history_data.to_pickle(date_path)
-            history_data.to_pickle(current_path)
-        else:
-            # history_data.to_csv(date_path)
-            history_data.to_csv(current_path)
+def store_table(history_data, date, data_type):
+    """
+    Returns False when the table matches the latest stored snapshot, in
+    which case nothing is rewritten.
+    """
+    # Dated copies go to the columnar store; current_* is what the app reads
+    changed = record_snapshot(history_data, date, data_type)
+    if not changed and (Path("history_data") / f"current_{data_type}.pkl").exists():
+        return False
+    publish_current(history_data, data_type, content_hash(history_data))
+    return True
 
 
 if __name__ == "__main__":
-    raw_table = get_history_data(DATA_TYPE)
-    history_table = format_history_data(raw_table)
-    store_table(history_table, f"{DATE}_{DATA_TYPE}")
+    args = parse_arguments()
+
+    # Reference data types, can be [0, 1, 7, 14, 30]
+    if args.data_types:
+        data_types = parse_data_types(args.data_types)
+    else:
+        data_types = [args.data_type]
+
+    record_dir = args.fixture_dir if args.record else None
+    if args.backend == "replay":
+        crawl = iter_history_data_replay(data_types, args.fixture_dir)
+    elif args.backend == "http":
+        crawl = iter_history_data_http(
+            data_types, args.wait_timeout, record_dir=record_dir
+        )
+    else:
+        crawl = iter_history_data(
+            data_types, args.legacy_extract, args.wait_timeout, record_dir
+        )
+    any_changed = False
+    for data_type, raw_table in crawl:
+        history_table = format_history_data(raw_table)
+        if args.no_store:
+            print(f"parsed data type {data_type} ({len(history_table)} players)")
+            continue
+        if store_table(history_table, args.date, data_type):
+            any_changed = True
+            print(f"stored data type {data_type} ({len(history_table)} players)")
+        else:
+            print(f"data type {data_type} unchanged since the latest snapshot")
+
+    if not args.no_store and not any_changed:
+        sys.exit(EXIT_UNCHANGED)
@@ -0,0 +1,221 @@
+"""
+Array building blocks for roster projections.
+
+A StatsMap is a loaded snapshot kept as its float32 stats block, indexed by
+player key; per-player dicts are only built when a row is looked up. Its
+StatsMatrix shares that block, so a roster's per-game stats are one
+fancy-index gather. schedule_mask
+turns a week schedule into a players x days bool mask by gathering each
+player's team column once. Projected totals are then games @ stats, and a
+LeagueStrength compares every team's totals with every other team's at once.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from player_names import PLAYER_KEY
+from snapshot_schema import PLAYER_ID, STAT_COLUMNS, STAT_DECIMALS
+
+
+class StatsMatrix:
+    """
+    Stats rows looked up by player key. values may be a snapshot's float32
+    block; gathered stats are float64 rounded to the published decimals, so
+    totals carry no float32 noise (9.9, not 9.899999618530273).
+    """
+
+    def __init__(self, row_of, values, columns=STAT_COLUMNS):
+        self.row_of = row_of
+        self.keys = list(row_of)
+        self.columns = list(columns)
+        self.column_of = {col: j for j, col in enumerate(self.columns)}
+        self.values = values
+
+    @classmethod
+    def from_rows(cls, stats_map, columns=STAT_COLUMNS):
+        """Build from a plain {player key: stats row} dict."""
+        values = np.zeros((len(stats_map), len(columns)), dtype="float64")
+        for i, row in enumerate(stats_map.values()):
+            for j, col in enumerate(columns):
+                if col in row:
+                    values[i, j] = float(row[col])
+        return cls({key: i for i, key in enumerate(stats_map)}, values, columns)
+
+    def rows(self, keys):
+        """Row of each key, -1 for None or unknown keys."""
+        return np.array([self.row_of.get(key, -1) for key in keys], dtype="intp")
+
+    def gather(self, keys, categories):
+        """
+        len(keys) x len(categories) stats; rows of unknown keys and
+        categories that are not stats columns are zero.
+        """
+        rows = self.rows(keys)
+        cols = np.array([self.column_of.get(c, -1) for c in categories], dtype="intp")
+        out = np.zeros((len(rows), len(cols)), dtype="float64")
+        row_ok = rows >= 0
+        col_ok = cols >= 0
+        if row_ok.any() and col_ok.any():
+            values = self.values[np.ix_(rows[row_ok], cols[col_ok])]
+            out[np.ix_(row_ok, col_ok)] = values.astype("float64").round(STAT_DECIMALS)
+        return out
+
+
+class StatsMap(Mapping):
+    """
+    Read-only {player key: stats row} view of a published snapshot. The
+    stats stay in the snapshot's float32 block, shared with `matrix`; a row
+    dict is built when it is looked up, with stats rounded to the published
+    decimals as Python floats. A repeated key maps to its last row.
+    """
+
+    def __init__(self, snapshot):
+        self.row_of = dict(zip(snapshot[PLAYER_KEY].tolist(), range(len(snapshot))))
+        self.players = snapshot["PLAYER"].to_numpy()
+        self.teams = snapshot["TEAM"].to_numpy()
+        self.ids = snapshot[PLAYER_ID].to_numpy()
+        self.stats = snapshot[STAT_COLUMNS].to_numpy()
+        self.matrix = StatsMatrix(self.row_of, self.stats)
+
+    def __getitem__(self, key):
+        i = self.row_of[key]
+        row = {
+            "PLAYER": self.players[i],
+            "TEAM": self.teams[i],
+            PLAYER_KEY: key,
+            PLAYER_ID: int(self.ids[i]),
+        }
+        stats = self.stats[i].astype("float64").round(STAT_DECIMALS)
+        row.update(zip(STAT_COLUMNS, stats.tolist()))
+        return row
+
+    def __contains__(self, key):
+        return key in self.row_of
+
+    def __iter__(self):
+        return iter(self.row_of)
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def player_names(self):
+        """PLAYER of every key, without building the row dicts."""
+        return [self.players[i] for i in self.row_of.values()]
+
+
+def schedule_mask(schedule_df, team_codes, dates):
+    """
+    players x dates bool: True where the player's team (schedule column
+    code) plays on that date. Unknown teams or dates are False.
+    """
+    games = schedule_df.to_numpy() == 1
+    team_of = {team: j for j, team in enumerate(schedule_df.columns)}
+    date_of = {day: i for i, day in enumerate(schedule_df.index)}
+    team_pos = np.array([team_of.get(t, -1) for t in team_codes], dtype="intp")
+    date_pos = np.array([date_of.get(d, -1) for d in dates], dtype="intp")
+    mask = games[np.ix_(date_pos.clip(0), team_pos.clip(0))].T
+    return mask & (team_pos >= 0)[:, None] & (date_pos >= 0)[None, :]
+
+
+def shooting_percentages(fgm, fga, threepm, ftm, fta):
+    """(AFG%, FT%) as fractions; 0 where there were no attempts."""
+    fgm, fga, threepm, ftm, fta = (
+        np.asarray(x, dtype="float64") for x in (fgm, fga, threepm, ftm, fta)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        afg = np.where(fga > 0, (fgm + 0.5 * threepm) / fga, 0.0)
+        ft = np.where(fta > 0, ftm / fta, 0.0)
+    return afg, ft
+
+
+def team_totals(player_team, player_games, player_stats, n_teams):
+    """
+    Sum each fantasy team's projected totals.
+
+    player_team: team row of every player; player_games: periods x players
+    game counts; player_stats: players x categories per-game stats.
+    Returns n_teams x periods x categories.
+    """
+    onehot = np.zeros((n_teams, len(player_team)), dtype="float64")
+    onehot[player_team, np.arange(len(player_team))] = 1.0
+    return np.einsum("tp,wp,pc->twc", onehot, player_games, player_stats)
+
+
+def matchup_outcomes(totals, lower_is_better, decimals=None):
+    """
+    All-pairs category results of teams x periods x categories totals, as a
+    teams x teams x periods x categories int8 array: +1 where the row team
+    beats the column team, -1 where it loses, 0 on a tie.
+    lower_is_better: bool per category (TO), flips the sign of the result.
+    decimals: per category, the precision totals are compared at (the one
+    they are shown with), so float noise cannot break a displayed tie.
+    """
+    if decimals is not None:
+        totals = np.round(totals * 10.0 ** np.asarray(decimals))
+    direction = np.where(np.asarray(lower_is_better, dtype=bool), -1, 1)
+    diff = totals[:, None] - totals[None, :]
+    return (np.sign(diff) * direction).astype("int8")
+
+
+class LeagueStrength:
+    """
+    Every fantasy team against every other for every period.
+
+    totals: teams x periods x categories projections. outcomes[a, b, w, c]
+    is +1/-1/0 as team a wins/loses/ties category c against team b in
+    period w, compared at decimals ({category: decimals}) when given;
+    wins/losses count them over the scored categories only.
+    """
+
+    def __init__(
+        self,
+        team_names,
+        weeks,
+        categories,
+        totals,
+        lower_is_better=(),
+        unscored=(),
+        decimals=None,
+    ):
+        self.team_names = list(team_names)
+        self.team_index = {name: i for i, name in enumerate(self.team_names)}
+        self.weeks = list(weeks)
+        self.week_index = {week: i for i, week in enumerate(self.weeks)}
+        self.categories = list(categories)
+        self.totals = totals
+        self.lower_is_better = np.array(
+            [c in lower_is_better for c in self.categories], dtype=bool
+        )
+        self.scored = np.array([c not in unscored for c in self.categories], dtype=bool)
+        if decimals is not None:
+            decimals = [decimals[c] for c in self.categories]
+        self.outcomes = matchup_outcomes(totals, self.lower_is_better, decimals)
+        scored = self.outcomes[..., self.scored]
+        self.wins = (scored > 0).sum(axis=-1)
+        self.losses = (scored < 0).sum(axis=-1)
+
+    def opponents(self, team):
+        """Rows of every team but team, in league order."""
+        t = self.team_index[team]
+        return [i for i in range(len(self.team_names)) if i != t]
+
+    def power_table(self, weeks=None):
+        """
+        {column: per-team array}: category wins/losses/ties against every
+        other team summed over weeks (all by default), and head-to-head
+        matchups won/lost.
+        """
+        cols = [self.week_index[w] for w in (weeks or self.weeks)]
+        n = len(self.team_names)
+        others = ~np.eye(n, dtype=bool)[:, :, None]
+        wins = self.wins[:, :, cols]
+        losses = self.losses[:, :, cols]
+        ties = int(self.scored.sum()) - wins - losses
+        return {
+            "Cat W": (wins * others).sum(axis=(1, 2)),
+            "Cat L": (losses * others).sum(axis=(1, 2)),
+            "Cat T": (ties * others).sum(axis=(1, 2)),
+            "Matchups W": ((wins > losses) & others).sum(axis=(1, 2)),
+            "Matchups L": ((wins < losses) & others).sum(axis=(1, 2)),
+        }
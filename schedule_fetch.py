@@ -0,0 +1,172 @@
+"""
+Concurrent page fetching for the NBA schedule scraper.
+
+Team pages are downloaded by a bounded thread pool that shares one pooled
+requests.Session. Requests to the same host are spaced by a rate limiter,
+and failed attempts (connection errors, 429 and 5xx responses) are retried
+with jittered exponential backoff. Every page that still fails is returned
+as a FetchFailure instead of being dropped with a print. An optional
+http_cache.ResponseCache turns repeat fetches into conditional requests.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import FRESH, REVALIDATED
+
+MAX_WORKERS = 8
+# Requests per second sent to one host
+RATE_PER_HOST = 4.0
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchFailure:
+    """Why a page could not be fetched after all attempts."""
+
+    def __init__(self, name, url, reason, attempts, status=None):
+        self.name = name
+        self.url = url
+        self.reason = reason
+        self.attempts = attempts
+        self.status = status
+
+    def __repr__(self):
+        return f"FetchFailure({self.name!r}, {self.reason!r}, attempts={self.attempts})"
+
+
+class HostRateLimiter:
+    """Keep requests to each host at least 1 / rate seconds apart."""
+
+    def __init__(self, rate=RATE_PER_HOST):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def make_session(headers=None, pool_size=MAX_WORKERS):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE):
+    """Full-jitter exponential backoff before retry number `attempt`."""
+    return random.uniform(0, base * 2**attempt)
+
+
+def fetch_page(
+    session,
+    name,
+    url,
+    limiter,
+    timeout=10,
+    max_attempts=MAX_ATTEMPTS,
+    cache=None,
+):
+    """
+    Fetch one page, retrying transient errors.
+
+    Returns (response, None) on success or (None, FetchFailure). With a
+    cache, fresh entries are served without a request, stale ones are
+    revalidated, and the response is a CachedPage.
+    """
+    cached = cache.lookup(url) if cache else None
+    request_headers = {}
+    if cached:
+        meta, body = cached
+        if cache.is_fresh(meta):
+            return cache.serve(url, meta, body, FRESH), None
+        request_headers = cache.conditional_headers(meta)
+
+    reason, status = None, None
+    for attempt in range(1, max_attempts + 1):
+        limiter.wait(url)
+        try:
+            response = session.get(url, timeout=timeout, headers=request_headers)
+        except requests.RequestException as e:
+            reason, status = f"{type(e).__name__}: {e}", None
+        else:
+            if response.status_code == 304 and cached:
+                return cache.serve(url, meta, body, REVALIDATED), None
+            if response.status_code < 400:
+                if cache:
+                    return cache.store(url, response), None
+                return response, None
+            reason, status = f"HTTP {response.status_code}", response.status_code
+            if response.status_code not in RETRY_STATUSES:
+                return None, FetchFailure(name, url, reason, attempt, status)
+        if attempt < max_attempts:
+            time.sleep(backoff_delay(attempt))
+    return None, FetchFailure(name, url, reason, max_attempts, status)
+
+
+def fetch_pages(
+    urls,
+    headers=None,
+    max_workers=MAX_WORKERS,
+    rate=RATE_PER_HOST,
+    timeout=10,
+    max_attempts=MAX_ATTEMPTS,
+    cache=None,
+):
+    """
+    Fetch {name: url} concurrently, through a ResponseCache if given.
+
+    Returns ({name: response}, {name: FetchFailure}); every name lands in
+    exactly one of the two.
+    """
+    limiter = HostRateLimiter(rate)
+    responses, failures = {}, {}
+    with make_session(headers, pool_size=max_workers) as session:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                name: pool.submit(
+                    fetch_page,
+                    session,
+                    name,
+                    url,
+                    limiter,
+                    timeout,
+                    max_attempts,
+                    cache,
+                )
+                for name, url in urls.items()
+            }
+            for name, future in futures.items():
+                response, failure = future.result()
+                if failure is None:
+                    responses[name] = response
+                else:
+                    failures[name] = failure
+    return responses, failures
+
+
+def print_failure_report(failures):
+    if not failures:
+        return
+    print(f"Failed to fetch {len(failures)} page(s):")
+    for name, failure in sorted(failures.items()):
+        print(f"  {name}: {failure.reason} after {failure.attempts} attempt(s)")
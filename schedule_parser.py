@@ -0,0 +1,149 @@
+"""
+Extract game dates from nba.com team schedule pages.
+
+The page is a Next.js app, so its schedule is normally embedded as JSON in
+<script id="__NEXT_DATA__">; reading that is a str.find plus json.loads. If
+the payload is missing or holds no games, only the schedule <tbody> is cut
+out of the page and run through a small HTMLParser, instead of parsing the
+whole document.
+
+Dates are returned as labels formatted like the weekly tables' index
+("Jan 26", no leading zero).
+"""
+
+import json
+from datetime import date
+from html.parser import HTMLParser
+
+from season_schedule import date_label
+
+NEXT_DATA_MARKER = '<script id="__NEXT_DATA__"'
+# The hashed suffix of the class name (Crom_body__UYOcU) changes between builds
+TBODY_CLASS_PREFIX = "Crom_body"
+# Game date fields in the embedded JSON, in order of preference; Eastern
+# dates match the calendar day shown on the site
+JSON_DATE_KEYS = ("gameDateEst", "gameDateTimeEst", "gameDate")
+
+
+def _team_ids(game):
+    ids = {game.get("teamId")}
+    for value in game.values():
+        if isinstance(value, dict):
+            ids.add(value.get("teamId"))
+    return {str(team_id) for team_id in ids if team_id is not None}
+
+
+def _walk_game_dates(node, team_id, found):
+    if isinstance(node, dict):
+        for key in JSON_DATE_KEYS:
+            value = node.get(key)
+            if isinstance(value, str) and len(value) >= 10:
+                # Skip other teams' games (e.g. a league scoreboard widget)
+                if team_id is None or str(team_id) in _team_ids(node):
+                    try:
+                        found.add(date.fromisoformat(value[:10]))
+                    except ValueError:
+                        pass
+                break
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _walk_game_dates(value, team_id, found)
+    elif isinstance(node, list):
+        for value in node:
+            if isinstance(value, (dict, list)):
+                _walk_game_dates(value, team_id, found)
+
+
+def parse_next_data(html, team_id=None):
+    """
+    Return game date labels from the embedded __NEXT_DATA__ JSON, or None.
+    With team_id, only games that list that team id are counted.
+    """
+    start = html.find(NEXT_DATA_MARKER)
+    if start < 0:
+        return None
+    start = html.find(">", start) + 1
+    end = html.find("</script>", start)
+    if start <= 0 or end < 0:
+        return None
+    try:
+        payload = json.loads(html[start:end])
+    except ValueError:
+        return None
+    if isinstance(payload, dict):
+        payload = payload.get("props", payload)
+    found = set()
+    _walk_game_dates(payload, team_id, found)
+    if not found:
+        return None
+    return {date_label(day) for day in found}
+
+
+class FirstCellParser(HTMLParser):
+    """Collect the text of the first <td> of every row."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.first_cells = []
+        self._cell_index = -1
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._cell_index = -1
+        elif tag == "td":
+            self._cell_index += 1
+            if self._cell_index == 0:
+                self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag == "td" and self._cell is not None:
+            self.first_cells.append("".join(self._cell).strip())
+            self._cell = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def extract_schedule_tbody(html):
+    """Return the markup of the schedule <tbody>, or None if it is missing."""
+    start = html.find("<tbody")
+    while start >= 0:
+        tag_end = html.find(">", start)
+        if tag_end < 0:
+            return None
+        if f'class="{TBODY_CLASS_PREFIX}' in html[start:tag_end]:
+            end = html.find("</tbody>", tag_end)
+            if end < 0:
+                return None
+            return html[start : end + len("</tbody>")]
+        start = html.find("<tbody", tag_end)
+    return None
+
+
+def parse_schedule_table(html):
+    """Return game date labels from the rendered schedule table, or None."""
+    tbody = extract_schedule_tbody(html)
+    if tbody is None:
+        return None
+    parser = FirstCellParser()
+    parser.feed(tbody)
+    parser.close()
+    return {cell for cell in parser.first_cells if cell}
+
+
+def parse_schedule_page(content, team_id=None):
+    """
+    Return (game_date_labels, source) for a team schedule page, where source
+    is "json", "table", or None when neither was found.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+    game_dates = parse_next_data(content, team_id)
+    if game_dates is not None:
+        return game_dates, "json"
+    game_dates = parse_schedule_table(content)
+    if game_dates is not None:
+        return game_dates, "table"
+    return set(), None
@@ -0,0 +1,209 @@
+"""
+Season-wide NBA schedule as one boolean matrix.
+
+weekly_schedule/season.npz holds a days x teams bool matrix of games, the
+real date of every row, the team codes of every column, and the day range
+of every fantasy period (w1, w2, ...). A week is a zero-copy row slice of
+the matrix, and games per team per period come from a cumulative count, so
+neither needs pandas cell indexing.
+"""
+
+import argparse
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from get_week_range import schedule
+from snapshot_publish import atomic_write
+
+SCHEDULE_DIR = Path(__file__).resolve().parent / "weekly_schedule"
+SEASON_FILE = SCHEDULE_DIR / "season.npz"
+WEEK_FILE_PATTERN = re.compile(r"^(w\d+)\.pkl$")
+
+
+def date_label(day):
+    """Format a date like the schedule tables' columns: 'Jan 26'."""
+    return f"{day.strftime('%b')} {day.day}"
+
+
+def week_sort_key(week):
+    return int(week[1:])
+
+
+class SeasonSchedule:
+    def __init__(self, games, dates, teams, periods):
+        self.games = np.asarray(games, dtype=bool)
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.teams = [str(team) for team in teams]
+        # week -> slice of rows
+        self.periods = dict(periods)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.labels = [date_label(day) for day in pd.DatetimeIndex(self.dates)]
+        self._cumulative = None
+
+    @classmethod
+    def empty(cls, teams, period_ranges=None):
+        """A schedule with no games covering every period in period_ranges."""
+        period_ranges = schedule if period_ranges is None else period_ranges
+        first = min(start for start, _ in period_ranges.values())
+        last = max(end for _, end in period_ranges.values())
+        dates = np.arange(
+            np.datetime64(first.date(), "D"),
+            np.datetime64(last.date(), "D") + 1,
+        )
+        periods = {}
+        for week, (start, end) in period_ranges.items():
+            offset = (start - first).days
+            periods[week] = slice(offset, offset + (end - start).days + 1)
+        return cls(
+            np.zeros((len(dates), len(teams)), dtype=bool), dates, teams, periods
+        )
+
+    @classmethod
+    def load(cls, path=SEASON_FILE):
+        with np.load(path, allow_pickle=False) as data:
+            periods = {
+                str(week): slice(int(start), int(stop))
+                for week, (start, stop) in zip(data["weeks"], data["week_bounds"])
+            }
+            return cls(data["games"], data["dates"], data["teams"], periods)
+
+    def save(self, path=SEASON_FILE):
+        weeks = self.weeks()
+        bounds = np.array(
+            [[self.periods[w].start, self.periods[w].stop] for w in weeks],
+            dtype="int32",
+        )
+        atomic_write(
+            path,
+            lambda f: np.savez_compressed(
+                f,
+                games=self.games,
+                dates=self.dates,
+                teams=np.array(self.teams),
+                weeks=np.array(weeks),
+                week_bounds=bounds,
+            ),
+        )
+
+    def weeks(self):
+        return sorted(self.periods, key=week_sort_key)
+
+    def day_index(self, day):
+        """Row of a date, or None if it is outside the season."""
+        offset = int(
+            (np.datetime64(pd.Timestamp(day).date(), "D") - self.dates[0]).astype(int)
+        )
+        return offset if 0 <= offset < len(self.dates) else None
+
+    def week_view(self, week):
+        """days x teams bool view of one period (no copy)."""
+        return self.games[self.periods[week]]
+
+    def week_labels(self, week):
+        return self.labels[self.periods[week]]
+
+    def week_frame(self, week):
+        """One period as a DataFrame indexed by 'Jan 26' labels, team columns."""
+        return pd.DataFrame(
+            self.week_view(week),
+            index=self.week_labels(week),
+            columns=self.teams,
+            copy=False,
+        )
+
+    def _cumulative_games(self):
+        if self._cumulative is None:
+            cumulative = np.zeros((len(self.dates) + 1, len(self.teams)), dtype="int32")
+            np.cumsum(self.games, axis=0, out=cumulative[1:])
+            self._cumulative = cumulative
+        return self._cumulative
+
+    def team_games(self, team, week):
+        """Number of games a team plays in a period (0 for unknown teams)."""
+        col = self.team_index.get(team)
+        if col is None:
+            return 0
+        rows = self.periods[week]
+        cumulative = self._cumulative_games()
+        return int(cumulative[rows.stop, col] - cumulative[rows.start, col])
+
+    def games_per_period(self, weeks=None):
+        """periods x teams array of game counts, in the order of weeks."""
+        weeks = self.weeks() if weeks is None else weeks
+        cumulative = self._cumulative_games()
+        starts = [self.periods[w].start for w in weeks]
+        stops = [self.periods[w].stop for w in weeks]
+        return cumulative[stops] - cumulative[starts]
+
+    def set_games(self, start_date, games, teams):
+        """Overwrite the rows from start_date on with a days x teams matrix."""
+        row = self.day_index(start_date)
+        games = np.asarray(games, dtype=bool)
+        cols = [self.team_index[team] for team in teams]
+        self.games[row : row + len(games), cols] = games
+        self._cumulative = None
+
+
+def load_season_schedule(path=SEASON_FILE):
+    """Return the stored SeasonSchedule, or None if it has not been built."""
+    if not os.path.exists(path):
+        return None
+    return SeasonSchedule.load(path)
+
+
+def migrate_weekly_pickles(schedule_dir=SCHEDULE_DIR, path=SEASON_FILE, remove=False):
+    """Build season.npz from the legacy weekly_schedule/w{N}.pkl tables."""
+    week_files = {}
+    for name in os.listdir(schedule_dir):
+        match = WEEK_FILE_PATTERN.match(name)
+        if match and match.group(1) in schedule:
+            week_files[match.group(1)] = os.path.join(schedule_dir, name)
+    if not week_files:
+        print(f"No weekly pickles in {schedule_dir}")
+        return None
+
+    teams = None
+    season = None
+    for week in sorted(week_files, key=week_sort_key):
+        table = pd.read_pickle(week_files[week])
+        if season is None:
+            teams = list(table.columns)
+            season = SeasonSchedule.empty(teams)
+        start, end = schedule[week]
+        expected = [date_label(day) for day in pd.date_range(start, end)]
+        if list(table.index) != expected:
+            raise ValueError(
+                f"{week_files[week]} does not cover {start.date()}..{end.date()}"
+            )
+        season.set_games(start, table[teams].to_numpy() == 1, teams)
+    season.save(path)
+    print(f"Wrote {path} ({len(season.dates)} days x {len(teams)} teams)")
+
+    if remove:
+        for file_path in week_files.values():
+            os.remove(file_path)
+        print(f"Removed {len(week_files)} weekly pickles")
+    return season
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the season schedule matrix.")
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Build season.npz from weekly_schedule/w*.pkl",
+    )
+    parser.add_argument(
+        "--remove-legacy",
+        action="store_true",
+        help="Delete the weekly pickles after migrating them",
+    )
+    args = parser.parse_args()
+    if args.migrate:
+        migrate_weekly_pickles(remove=args.remove_legacy)
+    else:
+        parser.print_help()
@@ -0,0 +1,112 @@
+"""
+Atomic publishing of the current_* stats files the app reads.
+
+Every file is written to a temporary file in the same directory and renamed
+over the target, so a reader sees either the old or the new file, never a
+truncated one. After the data files, history_data/current_manifest.json is
+updated with a per-file sequence number, content hash and publish time;
+readers poll that (one stat, plus a small JSON read when it changed) to
+learn that new data arrived without touching the data files.
+"""
+
+import datetime
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+PUBLISH_DIR = Path("history_data")
+VERSION_MANIFEST = "current_manifest.json"
+
+
+def atomic_write(path, write, mode="wb"):
+    """Call write(f) on a temp file next to path, then rename it over path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        # mkstemp creates 0600 files; published files must stay readable
+        os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, mode) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_versions(directory=PUBLISH_DIR):
+    try:
+        with open(Path(directory) / VERSION_MANIFEST, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish_current(history_data, data_type, digest, directory=PUBLISH_DIR):
+    """
+    Atomically replace current_{data_type}.pkl/.csv and bump its entry in
+    the version manifest. Returns the new version entry.
+    """
+    directory = Path(directory)
+    name = f"current_{data_type}"
+    atomic_write(directory / f"{name}.pkl", history_data.to_pickle)
+    atomic_write(directory / f"{name}.csv", history_data.to_csv, mode="w")
+
+    versions = load_versions(directory)
+    previous = versions.get(name, {})
+    versions[name] = {
+        "seq": previous.get("seq", 0) + 1,
+        "hash": digest,
+        "published_at": datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec="seconds"
+        ),
+    }
+    atomic_write(
+        directory / VERSION_MANIFEST,
+        lambda f: f.write(json.dumps(versions, indent=1, sort_keys=True) + "\n"),
+        mode="w",
+    )
+    return versions[name]
+
+
+class VersionWatcher:
+    """
+    Cheap reader-side view of the version manifest. version(file_path)
+    costs one stat of the manifest; it is only re-read when it changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._manifests = {}
+
+    def versions(self, directory):
+        path = Path(directory) / VERSION_MANIFEST
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return {}
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._manifests.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        versions = load_versions(directory)
+        with self._lock:
+            self._manifests[path] = (signature, versions)
+        return versions
+
+    def version(self, file_path):
+        """(seq, hash) of a published file, or None if it is not listed."""
+        file_path = Path(file_path)
+        entry = self.versions(file_path.parent).get(file_path.stem)
+        if entry is None:
+            return None
+        return entry["seq"], entry["hash"]
+
+
+watcher = VersionWatcher()
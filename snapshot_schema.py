@@ -0,0 +1,95 @@
+"""
+Schema of the stats snapshots the crawler publishes (history_data/current_*.pkl).
+
+Stats are float32, TEAM is categorical and every row carries a stable
+PLAYER_ID derived from the normalized name, so the same player has the
+same id in every snapshot. The schema version travels in DataFrame.attrs,
+which pickles keep, so readers can trust the dtypes without re-casting.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from player_names import PLAYER_KEY, normalize_names
+
+SCHEMA_VERSION = 1
+SCHEMA_VERSION_ATTR = "schema_version"
+
+PLAYER_ID = "PLAYER_ID"
+STAT_COLUMNS = [
+    "FGM",
+    "FGA",
+    "FTM",
+    "FTA",
+    "3PM",
+    "PTS",
+    "TREB",
+    "AST",
+    "STL",
+    "BLK",
+    "TO",
+]
+SNAPSHOT_COLUMNS = ["PLAYER", "TEAM", PLAYER_KEY, PLAYER_ID] + STAT_COLUMNS
+STAT_DTYPE = np.dtype("float32")
+# Decimals the site publishes stats with; float32 keeps them exactly after
+# rounding, but not as float64 values
+STAT_DECIMALS = 4
+
+
+class SnapshotSchemaError(ValueError):
+    pass
+
+
+def player_id(key):
+    """Stable signed 64-bit id of a normalized player name."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def enforce_schema(history_data):
+    """Cast a formatted stats table to the published snapshot schema."""
+    df = history_data.copy()
+    if PLAYER_KEY not in df.columns:
+        df[PLAYER_KEY] = normalize_names(df["PLAYER"])
+    keys = df[PLAYER_KEY]
+    ids = {key: player_id(key) for key in pd.unique(keys)}
+    df[PLAYER_ID] = keys.map(ids).astype("int64")
+    for col in STAT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype(STAT_DTYPE)
+    df["TEAM"] = df["TEAM"].astype(str).astype("category")
+    df = df[SNAPSHOT_COLUMNS].reset_index(drop=True)
+    df.attrs[SCHEMA_VERSION_ATTR] = SCHEMA_VERSION
+    return df
+
+
+def validate_snapshot(df):
+    """Raise SnapshotSchemaError unless df is a current-version snapshot."""
+    version = df.attrs.get(SCHEMA_VERSION_ATTR)
+    if version != SCHEMA_VERSION:
+        raise SnapshotSchemaError(
+            f"snapshot schema version {version}, expected {SCHEMA_VERSION}"
+        )
+    missing = [col for col in SNAPSHOT_COLUMNS if col not in df.columns]
+    if missing:
+        raise SnapshotSchemaError(f"snapshot is missing columns {missing}")
+    wrong = [col for col in STAT_COLUMNS if df[col].dtype != STAT_DTYPE]
+    if not isinstance(df["TEAM"].dtype, pd.CategoricalDtype):
+        wrong.append("TEAM")
+    if df[PLAYER_ID].dtype != np.dtype("int64"):
+        wrong.append(PLAYER_ID)
+    if wrong:
+        raise SnapshotSchemaError(f"snapshot columns with wrong dtype: {wrong}")
+    return df
+
+
+def load_snapshot(path):
+    """
+    Read a published snapshot. Files written before the schema existed are
+    cast once on load; versioned files are only validated.
+    """
+    df = pd.read_pickle(path)
+    if SCHEMA_VERSION_ATTR not in df.attrs:
+        return enforce_schema(df)
+    return validate_snapshot(df)
@@ -0,0 +1,127 @@
+from urllib.parse import parse_qs
+
+import pytest
+
+import player_stat_crawler as crawler
+
+HEADERS = ["R#", "PLAYER", "TEAM", "FG%", "FT%", "3PM", "PTS", "TREB"]
+HEADERS += ["AST", "STL", "BLK", "TO"]
+SELECTS = {
+    crawler.SHOW_SELECT_ID: [("25", "25"), ("All", "All")],
+    crawler.SOURCE_SELECT_ID: [("Yahoo", "Yahoo"), ("ESPN", "ESPN")],
+    crawler.DURATION_SELECT_ID: [(t, t) for t in ["0", "1", "7", "14", "30"]],
+}
+
+
+def select_name(select_id):
+    return "ctl00$" + select_id.replace("_", "$")
+
+
+class RankingsSite:
+    """
+    Stand-in for the WebForms rankings page: every postback must carry the
+    last view state, and the grid reflects the selected options.
+    """
+
+    def __init__(self, honor_duration=True):
+        self.state = {
+            select_id: options[0][0] for select_id, options in SELECTS.items()
+        }
+        self.view_state = 0
+        self.honor_duration = honor_duration
+        self.posts = []
+
+    def page(self):
+        parts = [
+            '<html><body><form method="post" id="form1">',
+            f'<input type="hidden" name="__VIEWSTATE" value="vs{self.view_state}">',
+            '<input type="hidden" name="__EVENTVALIDATION" value="ev">',
+            '<input type="hidden" name="__EVENTTARGET" value="">',
+            '<input type="submit" name="btnGo" value="Go">',
+        ]
+        for select_id, options in SELECTS.items():
+            parts.append(f'<select name="{select_name(select_id)}" id="{select_id}">')
+            for value, text in options:
+                selected = " selected" if self.state[select_id] == value else ""
+                parts.append(f'<option value="{value}"{selected}>{text}</option>')
+            parts.append("</select>")
+        parts.append(f'<table id="{crawler.TABLE_ID}"><tr>')
+        parts.extend(f"<th>{h}</th>" for h in HEADERS)
+        parts.append("</tr>")
+        rows = 3 if self.state[crawler.SHOW_SELECT_ID] == "All" else 1
+        duration = self.state[crawler.DURATION_SELECT_ID]
+        source = self.state[crawler.SOURCE_SELECT_ID]
+        for i in range(rows):
+            cells = [str(i + 1), f"Player {i}", source, "0.500 (5.0/10.0)"]
+            cells += ["0.800 (2.0/2.5)", duration, "20.0", "5.0"]
+            cells += ["3.0", "1.0", "0.5", "2.0"]
+            parts.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>")
+        parts.append("</table></form></body></html>")
+        return "".join(parts)
+
+    def handle(self, method, path, headers, body):
+        if method == "POST":
+            form = {k: v[0] for k, v in parse_qs(body.decode("utf-8")).items()}
+            self.posts.append(form)
+            if form.get("__VIEWSTATE") != f"vs{self.view_state}":
+                return 500, {}, "Invalid viewstate"
+            for select_id in SELECTS:
+                if select_id == crawler.DURATION_SELECT_ID and not self.honor_duration:
+                    continue
+                self.state[select_id] = form[select_name(select_id)]
+            self.view_state += 1
+        return 200, {"Content-Type": "text/html"}, self.page()
+
+
+def test_postbacks_carry_view_state_and_switch_ranges(stand_in_server):
+    site = RankingsSite()
+    server = stand_in_server(site.handle)
+
+    tables = dict(crawler.iter_history_data_http(["1", "7", "30"], url=server.url))
+
+    # Show=All, Source=ESPN, then one postback per duration
+    assert len(site.posts) == 5
+    assert [p["__VIEWSTATE"] for p in site.posts] == [f"vs{i}" for i in range(5)]
+    assert [p["__EVENTTARGET"] for p in site.posts] == [
+        select_name(crawler.SHOW_SELECT_ID),
+        select_name(crawler.SOURCE_SELECT_ID),
+    ] + [select_name(crawler.DURATION_SELECT_ID)] * 3
+    assert all("btnGo" not in p for p in site.posts)
+    for data_type, table in tables.items():
+        assert len(table) == 3
+        assert set(table["3PM"]) == {data_type}
+        assert set(table["TEAM"]) == {"ESPN"}
+
+
+def test_selected_option_is_not_posted_again(stand_in_server):
+    site = RankingsSite()
+    server = stand_in_server(site.handle)
+
+    # "0" is the page's default duration
+    tables = list(crawler.iter_history_data_http(["0"], url=server.url))
+
+    assert len(site.posts) == 2
+    assert set(tables[0][1]["3PM"]) == {"0"}
+
+
+def test_postback_that_keeps_the_old_range_raises(stand_in_server):
+    site = RankingsSite(honor_duration=False)
+    server = stand_in_server(site.handle)
+
+    with pytest.raises(ValueError, match=crawler.DURATION_SELECT_ID):
+        list(crawler.iter_history_data_http(["7"], url=server.url))
+
+
+def test_unknown_option_raises(stand_in_server):
+    site = RankingsSite()
+    server = stand_in_server(site.handle)
+    page = site.page()
+
+    with pytest.raises(ValueError, match="not found"):
+        crawler.http_choose_option(
+            crawler.requests.Session(),
+            server.url,
+            page,
+            crawler.SOURCE_SELECT_ID,
+            text="Fantrax",
+        )
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import gen_weekly_schedule as gen
+from schedule_fetch import FetchFailure
+from season_schedule import SeasonSchedule
+
+
+@pytest.fixture
+def stored_season(monkeypatch):
+    """A stored season where every team plays every day; saves are captured."""
+    stored = SeasonSchedule.empty(list(gen.team_id_dict))
+    stored.games[:] = True
+    saved = []
+    monkeypatch.setattr(gen, "load_season_schedule", lambda: stored)
+    monkeypatch.setattr(gen, "save_season", saved.append)
+    return stored, saved
+
+
+def fake_scrape(failed):
+    """Every fetched team plays on the first day only; failed teams have nothing."""
+
+    def scrape_season(start_date, end_date, **fetch_options):
+        dates = gen.gen_date_list_from_range(start_date, end_date)
+        table = pd.DataFrame(0, index=dates, columns=list(gen.team_id_dict))
+        table.iloc[0, :] = 1
+        table[failed] = 0
+        failures = {team: FetchFailure(team, "", "timeout", 4) for team in failed}
+        return table, failures
+
+    return scrape_season
+
+
+def test_run_all_weeks_keeps_stored_games_of_failed_teams(monkeypatch, stored_season):
+    _, saved = stored_season
+    monkeypatch.setattr(gen, "scrape_season", fake_scrape(["BOS"]))
+
+    failures = gen.run_all_weeks()
+
+    assert set(failures) == {"BOS"}
+    season = saved[-1]
+    assert season.games[:, season.team_index["BOS"]].all()
+    assert season.games[:, season.team_index["LAL"]].sum() == 1
+
+
+def test_scrape_week_keeps_stored_games_of_failed_teams(monkeypatch, stored_season):
+    _, saved = stored_season
+    monkeypatch.setattr(gen, "scrape_season", fake_scrape(["BOS", "DEN"]))
+    start, end = gen.schedule["w3"]
+
+    week, failures = gen.scrape_week("w3", start, end)
+
+    assert set(failures) == {"BOS", "DEN"}
+    assert week["BOS"].all() and week["DEN"].all()
+    assert week["LAL"].sum() == 1
+    # Other weeks are untouched
+    assert np.all(saved[-1].week_view("w4"))
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+import history_store as hs
+from snapshot_schema import STAT_COLUMNS
+
+
+def crawl(n_players, bump=None):
+    rows = []
+    for i in range(n_players):
+        row = {"PLAYER": f"Player {i}", "TEAM": "BOS"}
+        row.update({col: float(i) for col in STAT_COLUMNS})
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    if bump is not None:
+        df.loc[bump, "PTS"] += 10
+    return df
+
+
+def assert_same_table(stored, expected):
+    got = stored[["PLAYER", "TEAM"] + STAT_COLUMNS].reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+def test_same_day_recrawl_is_stored_as_a_delta(tmp_path):
+    hs.record_snapshot(crawl(40), "20260101", 1, tmp_path)
+    hs.record_snapshot(crawl(40, bump=3), "20260102", 1, tmp_path)
+    recrawl = crawl(40, bump=[3, 7])
+
+    assert hs.record_snapshot(recrawl, "20260102", 1, tmp_path)
+
+    snapshots = hs.load_manifest(tmp_path)["1"]["snapshots"]
+    assert snapshots["20260102"]["kind"] == "delta"
+    assert snapshots["20260102"]["base"] == "20260101"
+    assert len(pd.read_parquet(hs.partition_path("20260102", 1, tmp_path))) == 2
+    assert_same_table(hs.read_snapshot("20260102", 1, tmp_path), recrawl)
+    assert_same_table(hs.read_snapshot("20260101", 1, tmp_path), crawl(40))
+
+
+def test_same_day_recrawl_of_a_reference(tmp_path):
+    hs.record_snapshot(crawl(40), "20260101", 1, tmp_path)
+    hs.record_snapshot(crawl(40), "20260102", 1, tmp_path)
+    recrawl = crawl(40, bump=5)
+
+    assert hs.record_snapshot(recrawl, "20260102", 1, tmp_path)
+
+    entry = hs.load_manifest(tmp_path)["1"]
+    assert entry["snapshots"]["20260102"]["kind"] == "delta"
+    assert entry["latest"]["date"] == "20260102"
+    assert_same_table(hs.read_snapshot("20260102", 1, tmp_path), recrawl)
+
+
+def test_interrupted_partition_write_keeps_the_old_file(tmp_path, monkeypatch):
+    hs.record_snapshot(crawl(40), "20260101", 1, tmp_path)
+    path = hs.partition_path("20260101", 1, tmp_path)
+    before = path.read_bytes()
+
+    def fail(table, where, **kwargs):
+        where.write(b"PAR1 truncated")
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(hs.pq, "write_table", fail)
+    rows = hs._keyed(crawl(41)).assign(_op="key")
+    with pytest.raises(KeyboardInterrupt):
+        hs._write_partition(rows, "20260101", 1, tmp_path)
+
+    assert path.read_bytes() == before
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
@@ -0,0 +1,48 @@
+import threading
+
+from player_resolver import PlayerResolver
+
+KEYS = ["jimmy butler", "marcus morris", "bogdan bogdanovic", "nicolas claxton"]
+
+
+def test_tiers_and_snapshot():
+    resolver = PlayerResolver(KEYS)
+
+    assert resolver.resolve("Jimmy Butler").method == "exact"
+    assert resolver.resolve("Nic Claxton").method == "exact"
+    assert resolver.resolve("J. Butler").key == "jimmy butler"
+    assert resolver.resolve_key("Monte Morris") is None
+    assert resolver.resolve_key("Bojan Bogdanovic") is None
+
+    misses, approximate = resolver.snapshot()
+    assert set(misses) == {"Monte Morris", "Bojan Bogdanovic"}
+    assert set(approximate) == {"J. Butler"}
+    # Copies: later resolutions do not change a snapshot already taken
+    resolver.resolve("Jimmy Butler Jr.")
+    assert "Jimmy Butler Jr." in resolver.snapshot()[1]
+    assert "Jimmy Butler Jr." not in approximate
+
+
+def test_snapshot_while_resolving():
+    resolver = PlayerResolver(KEYS)
+    errors = []
+
+    def resolve_many():
+        for i in range(2000):
+            resolver.resolve(f"Player {i}")
+
+    def snapshot_many():
+        try:
+            for _ in range(2000):
+                resolver.snapshot()
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=f) for f in (resolve_many, snapshot_many)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(resolver.snapshot()[0]) == 2000
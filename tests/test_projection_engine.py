@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from player_names import PLAYER_KEY
+from projection_engine import StatsMap, StatsMatrix
+from snapshot_schema import STAT_COLUMNS, STAT_DTYPE, enforce_schema
+
+
+def snapshot():
+    rows = [
+        ("Nikola Jokic", "DEN", 9.9),
+        ("Jimmy Butler", "MIA", 5.1),
+        ("Jimmy Butler", "GS", 6.3),
+    ]
+    df = pd.DataFrame(
+        [{"PLAYER": p, "TEAM": t, **dict.fromkeys(STAT_COLUMNS, v)} for p, t, v in rows]
+    )
+    return enforce_schema(df)
+
+
+def test_stats_map_keeps_float32_and_builds_rounded_rows():
+    stats_map = StatsMap(snapshot())
+
+    assert stats_map.stats.dtype == STAT_DTYPE
+    assert stats_map.matrix.values is stats_map.stats
+    assert list(stats_map) == ["nikola jokic", "jimmy butler"]
+    assert len(stats_map) == 2 and "jimmy butler" in stats_map
+    assert stats_map.get("nobody") is None
+
+    row = stats_map["nikola jokic"]
+    assert row["PTS"] == 9.9 and type(row["PTS"]) is float
+    assert row["TEAM"] == "DEN" and row[PLAYER_KEY] == "nikola jokic"
+    # A repeated key maps to its last row
+    assert stats_map["jimmy butler"]["TEAM"] == "GS"
+    assert sorted(stats_map.player_names()) == ["Jimmy Butler", "Nikola Jokic"]
+
+
+def test_gather_matches_rows():
+    stats_map = StatsMap(snapshot())
+    keys = ["jimmy butler", None, "nikola jokic"]
+
+    stats = stats_map.matrix.gather(keys, ["PTS", "AFG%", "TO"])
+    from_rows = StatsMatrix.from_rows({k: stats_map[k] for k in stats_map}).gather(
+        keys, ["PTS", "AFG%", "TO"]
+    )
+
+    assert stats.dtype == np.float64
+    np.testing.assert_array_equal(stats, [[6.3, 0, 6.3], [0, 0, 0], [9.9, 0, 9.9]])
+    np.testing.assert_array_equal(stats, from_rows)
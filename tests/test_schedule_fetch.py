@@ -0,0 +1,81 @@
+import pytest
+
+import schedule_fetch
+from http_cache import FETCHED, REVALIDATED, ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(schedule_fetch, "backoff_delay", lambda attempt: 0)
+
+
+def scripted_server(stand_in_server, script):
+    """Serve path -> list of statuses, repeating the last one when exhausted."""
+    hits = {}
+
+    def handle(method, path, headers, body):
+        statuses = script[path]
+        status = statuses[min(hits.get(path, 0), len(statuses) - 1)]
+        hits[path] = hits.get(path, 0) + 1
+        return status, {"Content-Type": "text/html"}, f"{path} {status}"
+
+    return stand_in_server(handle), hits
+
+
+def test_retries_transient_errors_but_not_missing_pages(stand_in_server):
+    server, hits = scripted_server(
+        stand_in_server,
+        {"/flaky": [503, 503, 200], "/gone": [404], "/down": [503]},
+    )
+    urls = {name: f"{server.url}/{name}" for name in ["flaky", "gone", "down"]}
+
+    responses, failures = schedule_fetch.fetch_pages(
+        urls, rate=0, max_workers=3, max_attempts=3
+    )
+
+    assert set(responses) == {"flaky"}
+    assert responses["flaky"].text == "/flaky 200"
+    assert hits == {"/flaky": 3, "/gone": 1, "/down": 3}
+
+    assert set(failures) == {"gone", "down"}
+    assert failures["gone"].attempts == 1
+    assert failures["gone"].status == 404
+    assert failures["down"].attempts == 3
+    assert failures["down"].status == 503
+    assert failures["down"].url == urls["down"]
+
+
+def test_failure_report_lists_every_failed_page(stand_in_server, capsys):
+    server, _ = scripted_server(stand_in_server, {"/a": [500], "/b": [404]})
+    urls = {name: f"{server.url}/{name}" for name in ["a", "b"]}
+
+    _, failures = schedule_fetch.fetch_pages(urls, rate=0, max_attempts=2)
+    schedule_fetch.print_failure_report(failures)
+
+    out = capsys.readouterr().out
+    assert "Failed to fetch 2 page(s)" in out
+    assert "a: HTTP 500 after 2 attempt(s)" in out
+    assert "b: HTTP 404 after 1 attempt(s)" in out
+
+
+def test_stale_cache_entries_are_revalidated(stand_in_server, tmp_path):
+    seen = []
+
+    def handle(method, path, headers, body):
+        seen.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, {}, ""
+        return 200, {"ETag": '"v1"'}, "schedule"
+
+    server = stand_in_server(handle)
+    cache = ResponseCache(tmp_path, max_age=0)
+    urls = {"team": f"{server.url}/team"}
+
+    first, _ = schedule_fetch.fetch_pages(urls, rate=0, cache=cache)
+    second, failures = schedule_fetch.fetch_pages(urls, rate=0, cache=cache)
+
+    assert not failures
+    assert seen == [None, '"v1"']
+    assert first["team"].source == FETCHED
+    assert second["team"].source == REVALIDATED
+    assert second["team"].content == b"schedule"
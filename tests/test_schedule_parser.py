@@ -0,0 +1,24 @@
+import pytest
+
+from schedule_parser import parse_schedule_page
+
+
+def next_data_page(payload):
+    return (
+        '<html><body><script id="__NEXT_DATA__" type="application/json">'
+        f"{payload}</script></body></html>"
+    )
+
+
+@pytest.mark.parametrize("payload", ["null", "3", '"props"', "[]", "{}"])
+def test_payload_without_games_is_not_found(payload):
+    assert parse_schedule_page(next_data_page(payload)) == (set(), None)
+
+
+def test_list_payload_is_walked():
+    payload = '[{"gameDateEst": "2026-01-02T00:00:00Z", "teamId": 1}]'
+
+    assert parse_schedule_page(next_data_page(payload), team_id=1) == (
+        {"Jan 2"},
+        "json",
+    )
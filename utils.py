@@ -1,15 +1,23 @@
 import os
+import threading
+from collections import OrderedDict
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-from unidecode import unidecode
 
-# Manual name mappings
-NAME_MAPPING = {
-    "Alex Sarr": "Alexandre Sarr",
-    "Nic Claxton": "Nicolas Claxton",
-    "GG Jackson": "GG Jackson II",
-}
+from player_names import PLAYER_KEY
+from player_resolver import PlayerResolver
+from projection_engine import (
+    LeagueStrength,
+    StatsMap,
+    StatsMatrix,
+    schedule_mask,
+    shooting_percentages,
+    team_totals,
+)
+from snapshot_publish import watcher as version_watcher
+from snapshot_schema import PLAYER_ID, load_snapshot
 
 # Team Mapping (Inverted)
 TEAM_ABBREVIATION_MAPPING = {
@@ -22,6 +30,56 @@ TEAM_ABBREVIATION_MAPPING = {
     "WAS": "WSH",
 }
 
+# Snapshot columns that are not per-game stats
+NON_STAT_COLUMNS = ["PLAYER", "TEAM", PLAYER_KEY, PLAYER_ID]
+
+
+# Parsed stats files shared by every session: path -> (signature, stats_map)
+STATS_CACHE_SIZE = 8
+_stats_cache = OrderedDict()
+_stats_cache_lock = threading.Lock()
+
+
+def _file_signature(file_path):
+    # Manifest version (None for files it does not list) plus stat, so a
+    # file replaced without a manifest bump (git pull, a manual restore, a
+    # publish interrupted before the manifest) is reloaded too
+    stat = os.stat(file_path)
+    return version_watcher.version(file_path), stat.st_mtime_ns, stat.st_size
+
+
+def invalidate_stats_cache(file_path=None):
+    """Drop the cached stats map of one file, or of every file."""
+    with _stats_cache_lock:
+        if file_path is None:
+            _stats_cache.clear()
+        else:
+            _stats_cache.pop(os.path.abspath(file_path), None)
+
+
+def load_stats_map(file_path):
+    """
+    Return a StatsMap ({player key: stats row}) for a snapshot file, parsing
+    it only when its published version, mtime or size changed. The map is
+    shared between sessions and keeps the snapshot's float32 stats.
+    """
+    file_path = os.path.abspath(file_path)
+    signature = _file_signature(file_path)
+    with _stats_cache_lock:
+        cached = _stats_cache.get(file_path)
+        if cached is not None and cached[0] == signature:
+            _stats_cache.move_to_end(file_path)
+            return cached[1]
+
+    stats_map = StatsMap(load_snapshot(file_path))
+
+    with _stats_cache_lock:
+        _stats_cache[file_path] = (signature, stats_map)
+        _stats_cache.move_to_end(file_path)
+        while len(_stats_cache) > STATS_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+    return stats_map
+
 
 def get_player_stats_map(base_dir, filename):
     """
@@ -35,15 +93,7 @@ def get_player_stats_map(base_dir, filename):
             st.error(f"Stats file not found: {file_path}")
             return {}
 
-        df = pd.read_pickle(file_path)
-
-        # Create a dictionary for quick lookup: Name -> Series (Stats)
-        # Normalize keys: unidecode + lower + strip
-        stats_map = {
-            unidecode(name).lower().strip(): row
-            for name, row in zip(df["PLAYER"], df.to_dict("records"))
-        }
-        return stats_map
+        return load_stats_map(file_path)
     except Exception as e:
         st.error(f"Error loading stats file: {e}")
         return {}
@@ -51,12 +101,28 @@ def get_player_stats_map(base_dir, filename):
 
 def get_all_player_names(stats_map):
     """Return sorted list of original player names from stats map."""
-    names = []
-    for key, row in stats_map.items():
-        if "PLAYER" in row:
-            names.append(row["PLAYER"])
-    names.sort()
-    return names
+    if not stats_map:
+        return []
+    return sorted(stats_map.player_names())
+
+
+def _schedule_rows(players, team_codes, schedule_df, out=None):
+    """
+    Data editor rows: players ({Player, Pos, Team} dicts) followed by one
+    column per schedule date, True on game days (False if the player is
+    OUT) and None on days without a game.
+    """
+    if not players:
+        return pd.DataFrame()
+    dates = schedule_df.index.tolist()
+    has_game = schedule_mask(schedule_df, team_codes, dates)
+    cells = np.full(has_game.shape, None, dtype=object)
+    cells[has_game] = True
+    if out is not None:
+        # Default unchecked if player is OUT
+        cells[has_game & np.asarray(out, dtype=bool)[:, None]] = False
+    days = pd.DataFrame(cells, columns=dates).infer_objects()
+    return pd.concat([pd.DataFrame(players), days], axis=1)
 
 
 def build_added_player_schedule_rows(player_names, stats_map, schedule_df):
@@ -68,8 +134,7 @@ def build_added_player_schedule_rows(player_names, stats_map, schedule_df):
     if schedule_df is None:
         return pd.DataFrame()
 
-    dates = schedule_df.index.tolist()
-    rows = []
+    players, team_codes = [], []
     for p_name in player_names:
         p_stats = get_player_avg(p_name, stats_map)
         if not p_stats:
@@ -77,56 +142,81 @@ def build_added_player_schedule_rows(player_names, stats_map, schedule_df):
 
         # Get the player's real NBA team
         pro_team = p_stats.get("TEAM", "")
-        sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
+        players.append({"Player": p_name, "Pos": "ADD", "Team": pro_team})
+        team_codes.append(TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team))
+
+    return _schedule_rows(players, team_codes, schedule_df)
+
+
+# Indexes built from a stats map (the resolver, and a stats matrix for plain
+# dicts):
+# id(stats_map) -> (stats_map, {name: index}). Stats maps are shared per
+# snapshot version (see load_stats_map), so these are built once per version.
+_map_indexes = OrderedDict()
 
-        row = {"Player": p_name, "Pos": "ADD", "Team": pro_team}
-        for date in dates:
-            if (
-                sched_col in schedule_df.columns
-                and schedule_df.loc[date, sched_col] == 1
-            ):
-                row[date] = True
-            else:
-                row[date] = None
-        rows.append(row)
 
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+def _stats_map_index(s_map, name, build):
+    with _stats_cache_lock:
+        cached = _map_indexes.get(id(s_map))
+        if cached is not None and cached[0] is s_map:
+            _map_indexes.move_to_end(id(s_map))
+            if name in cached[1]:
+                return cached[1][name]
+    index = build(s_map)
+    with _stats_cache_lock:
+        cached = _map_indexes.get(id(s_map))
+        if cached is None or cached[0] is not s_map:
+            cached = _map_indexes[id(s_map)] = (s_map, {})
+        cached[1][name] = index
+        while len(_map_indexes) > STATS_CACHE_SIZE:
+            _map_indexes.popitem(last=False)
+    return index
 
 
-def get_player_avg(player_name, s_map):
-    lookup_name = player_name.strip()
-    if lookup_name in NAME_MAPPING:
-        lookup_name = NAME_MAPPING[lookup_name]
-    lookup_key = unidecode(lookup_name).lower().strip()
-    return s_map.get(lookup_key, {})
+def get_resolver(s_map):
+    return _stats_map_index(s_map, "resolver", lambda m: PlayerResolver(m.keys()))
+
+
+def get_stats_matrix(s_map):
+    # A loaded StatsMap already shares its stats block as a matrix
+    if isinstance(s_map, StatsMap):
+        return s_map.matrix
+    return _stats_map_index(s_map, "matrix", StatsMatrix.from_rows)
+
+
+def get_player_avg(player_name, s_map, espn_id=None):
+    if not s_map:
+        return {}
+    key = get_resolver(s_map).resolve_key(player_name, espn_id)
+    return s_map.get(key, {}) if key is not None else {}
+
+
+def get_unresolved_players(s_map):
+    """{roster name: Resolution} of names that matched no stats row so far."""
+    if not s_map:
+        return {}
+    return get_resolver(s_map).snapshot()[0]
+
+
+def get_approximate_players(s_map):
+    """{roster name: Resolution} of names matched by a non-exact tier so far."""
+    if not s_map:
+        return {}
+    return get_resolver(s_map).snapshot()[1]
 
 
 def get_team_schedule_data(team_obj, schedule_df):
     if schedule_df is None:
         return pd.DataFrame()
-    roster_rows = []
-    dates = schedule_df.index.tolist()
-    for player in team_obj.roster:
-        pro_team = player.proTeam
-        sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
-        row = {"Player": player.name, "Pos": player.position, "Team": pro_team}
-
-        # Check injury status
-        is_out = player.injuryStatus == "OUT"
-
-        if sched_col in schedule_df.columns:
-            for date in dates:
-                has_game = schedule_df.loc[date, sched_col]
-                if has_game == 1:
-                    # Default unchecked if player is OUT
-                    row[date] = False if is_out else True
-                else:
-                    row[date] = None
-        else:
-            for date in dates:
-                row[date] = None
-        roster_rows.append(row)
-    return pd.DataFrame(roster_rows)
+    players = [
+        {"Player": p.name, "Pos": p.position, "Team": p.proTeam}
+        for p in team_obj.roster
+    ]
+    team_codes = [
+        TEAM_ABBREVIATION_MAPPING.get(p.proTeam, p.proTeam) for p in team_obj.roster
+    ]
+    out = [p.injuryStatus == "OUT" for p in team_obj.roster]
+    return _schedule_rows(players, team_codes, schedule_df, out)
 
 
 def apply_batch_toggle(df, col_name, new_val):
@@ -156,51 +246,44 @@ def calculate_projected_stats(
     for k in base_totals:
         base_totals[k] = get_curr(k)
 
-    if not edited_df.empty:
-        # Skip Row 0 (Status Row)
-        df_players = edited_df.iloc[1:]
-
-        date_cols = [
-            c for c in df_players.columns if c not in ["Player", "Pos", "Team"]
+    # Skip Row 0 (Status Row)
+    if len(edited_df) > 1 and s_map:
+        columns = list(edited_df.columns)
+        date_pos = [
+            i for i, c in enumerate(columns) if c not in ["Player", "Pos", "Team"]
         ]
-        for index, row in df_players.iterrows():
-            # Count active games
-            games_active = 0
-
-            # Determine team schedule column if validation is needed
-            pro_team = row["Team"]
-            sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
-
-            for d in date_cols:
-                if row[d] is True:
-                    # Validate against schedule if provided
-                    if schedule_df is not None:
-                        # Check if game exists on this date for this team
-                        if sched_col in schedule_df.columns and d in schedule_df.index:
-                            if schedule_df.loc[d, sched_col] == 1:
-                                games_active += 1
-                    else:
-                        # Legacy behavior (trust the check) if no schedule passed
-                        games_active += 1
-
-            if games_active > 0:
-                p_stats = get_player_avg(row["Player"], s_map)
-                if p_stats:
-                    for k in base_totals:
-                        val = 0.0
-                        if k in p_stats:
-                            val = float(p_stats[k])
-                        base_totals[k] += val * games_active
+        values = edited_df.to_numpy(dtype=object)[1:]
+        players = values[:, columns.index("Player")]
+        # players x days: checked in the editor ...
+        active = values[:, date_pos] == True  # noqa: E712 (elementwise)
+        # ... and validated against the schedule if provided
+        if schedule_df is not None:
+            sched_cols = [
+                TEAM_ABBREVIATION_MAPPING.get(t, t)
+                for t in values[:, columns.index("Team")]
+            ]
+            date_cols = [columns[i] for i in date_pos]
+            active = active & schedule_mask(schedule_df, sched_cols, date_cols)
+        games_active = active.sum(axis=1)
+
+        resolver = get_resolver(s_map)
+        keys = [
+            resolver.resolve_key(name) if games > 0 else None
+            for name, games in zip(players, games_active)
+        ]
+        categories = list(base_totals)
+        stats = get_stats_matrix(s_map).gather(keys, categories)
+        for k, total in zip(categories, games_active @ stats):
+            base_totals[k] += total
 
     # Aggregates
-    fgm = base_totals.get("FGM", 0)
-    fga = base_totals.get("FGA", 0)
-    threepm = base_totals.get("3PM", 0)
-    ftm = base_totals.get("FTM", 0)
-    fta = base_totals.get("FTA", 0)
-
-    afg_pct = (fgm + 0.5 * threepm) / fga if fga > 0 else 0.0
-    ft_pct = ftm / fta if fta > 0 else 0.0
+    afg_pct, ft_pct = shooting_percentages(
+        base_totals.get("FGM", 0),
+        base_totals.get("FGA", 0),
+        base_totals.get("3PM", 0),
+        base_totals.get("FTM", 0),
+        base_totals.get("FTA", 0),
+    )
 
     final_stats = {}
     for k in desired_order:
@@ -221,33 +304,25 @@ def enforce_no_game_constraints(edited_df, schedule_df):
     if schedule_df is None or edited_df.empty:
         return edited_df, False
 
-    changed = False
-
-    # Iterate over player rows (index 1 to end)
-    # We skip row 0 (Daily Status) for individual enforcement as it's a control row.
+    # Row 0 (Daily Status) is a control row and is not enforced
     df_players = edited_df.iloc[1:]
     date_cols = [c for c in df_players.columns if c not in ["Player", "Pos", "Team"]]
+    if df_players.empty or not date_cols:
+        return edited_df, False
 
-    for idx in df_players.index:
-        row = edited_df.loc[idx]
-        pro_team = row["Team"]
-        sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
-
-        for d in date_cols:
-            val = row[d]
-            # If user checked it (True), verify if it's valid
-            if val is True:
-                is_valid = False
-                if sched_col in schedule_df.columns and d in schedule_df.index:
-                    if schedule_df.loc[d, sched_col] == 1:
-                        is_valid = True
-
-                if not is_valid:
-                    # Revert to None (unchecked/empty)
-                    edited_df.at[idx, d] = None
-                    changed = True
+    sched_cols = [TEAM_ABBREVIATION_MAPPING.get(t, t) for t in df_players["Team"]]
+    checked = df_players[date_cols].to_numpy(dtype=object) == True  # noqa: E712
+    # Checked days on which the player's team does not play
+    invalid = checked & ~schedule_mask(schedule_df, sched_cols, date_cols)
+    if not invalid.any():
+        return edited_df, False
 
-    return edited_df, changed
+    for j in np.flatnonzero(invalid.any(axis=0)):
+        # Revert to None (unchecked/empty)
+        values = edited_df[date_cols[j]].to_numpy(dtype=object, copy=True)
+        values[1:][invalid[:, j]] = None
+        edited_df[date_cols[j]] = values
+    return edited_df, True
 
 
 from datetime import datetime
@@ -335,23 +410,17 @@ def prepare_roster_data(team, stats_map):
     for player in team.roster:
         player_info = {"Name": player.name}
 
-        # Resolve Name
-        lookup_name = player.name.strip()
-        if lookup_name in NAME_MAPPING:
-            lookup_name = NAME_MAPPING[lookup_name]
-        lookup_key = unidecode(lookup_name).lower().strip()
-
         # Merge Stats
-        if lookup_key in stats_map:
-            stats = stats_map[lookup_key]
+        stats = get_player_avg(player.name, stats_map, player.playerId)
+        if stats:
             for key, value in stats.items():
-                if key not in ["PLAYER", "TEAM"]:
+                if key not in NON_STAT_COLUMNS:
                     player_info[key] = value
         else:
             if stats_map:
                 example_stats = next(iter(stats_map.values()))
                 for key in example_stats:
-                    if key not in ["PLAYER", "TEAM"]:
+                    if key not in NON_STAT_COLUMNS:
                         player_info[key] = 0
             else:
                 player_info["Stats"] = "N/A"
@@ -361,6 +430,201 @@ def prepare_roster_data(team, stats_map):
     return pd.DataFrame(roster_data) if roster_data else pd.DataFrame()
 
 
+def _projection_entries(team_obj, active_players=None):
+    """
+    Players a team projection counts, as (name, espn id, schedule column).
+    All non-OUT roster players, or exactly active_players if given; pool
+    players added by name have no ESPN id and take their TEAM from stats.
+    """
+    entries = []
+    for player in team_obj.roster:
+        # Skip OUT players (unless explicitly selected via active_players)
+        if active_players is not None:
+            if player.name not in active_players:
+                continue
+        elif player.injuryStatus == "OUT":
+            continue
+        pro_team = player.proTeam
+        sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
+        entries.append((player.name, player.playerId, sched_col))
+
+    # Non-roster players (added from league pool)
+    if active_players is not None:
+        roster_names = {p.name for p in team_obj.roster}
+        for p_name in active_players:
+            if p_name not in roster_names:
+                entries.append((p_name, None, None))
+    return entries
+
+
+def project_league(
+    team_entries, games, schedule_teams, stats_map, categories, alias_mapping
+):
+    """
+    Projected totals for many teams and periods in one pass.
+
+    team_entries: per team, the _projection_entries list; games: periods x
+    schedule_teams game counts. Returns teams x periods x categories.
+    """
+    resolver = get_resolver(stats_map)
+    matrix = get_stats_matrix(stats_map)
+    team_col = {team: j for j, team in enumerate(schedule_teams)}
+
+    player_team, keys, cols = [], [], []
+    for t, entries in enumerate(team_entries):
+        for name, espn_id, sched_col in entries:
+            key = resolver.resolve_key(name, espn_id) if stats_map else None
+            if sched_col is None and key is not None:
+                pro_team = stats_map[key].get("TEAM", "")
+                sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
+            player_team.append(t)
+            keys.append(key)
+            cols.append(team_col.get(sched_col, -1))
+
+    # Check alias mapping where a category is not a stats column
+    stat_names = [
+        k if k in matrix.column_of else alias_mapping.get(k, k) for k in categories
+    ]
+    stats = matrix.gather(keys, stat_names)
+    cols = np.array(cols, dtype="intp")
+    games = np.asarray(games, dtype="float64")
+    player_games = np.where(cols >= 0, games[:, cols.clip(0)], 0.0)
+    return team_totals(
+        np.array(player_team, dtype="intp"),
+        player_games,
+        stats,
+        len(team_entries),
+    )
+
+
+def calculate_league_projections(
+    teams,
+    season,
+    weeks,
+    stats_map,
+    desired_order,
+    alias_mapping,
+    active_players=None,
+):
+    """
+    Projected stats of every team for every week in one vectorized pass.
+
+    teams: ESPN team objects; season: SeasonSchedule; active_players:
+    {team_name: [player names]} (teams missing from it use their non-OUT
+    roster). Returns a teams x weeks x desired_order float array with AFG%
+    and FT% as fractions, like calculate_projected_stats_simple.
+    """
+    active_players = active_players or {}
+    team_entries = [
+        _projection_entries(team, active_players.get(team.team_name)) for team in teams
+    ]
+    categories = [k for k in desired_order if k not in ["AFG%", "FT%"]]
+    totals = project_league(
+        team_entries,
+        season.games_per_period(weeks),
+        season.teams,
+        stats_map,
+        categories,
+        alias_mapping,
+    )
+
+    result = np.zeros(totals.shape[:2] + (len(desired_order),), dtype="float64")
+    cat_index = {k: i for i, k in enumerate(categories)}
+    zero = np.zeros(totals.shape[:2])
+
+    def total(k):
+        return totals[..., cat_index[k]] if k in cat_index else zero
+
+    afg, ft = shooting_percentages(
+        total("FGM"), total("FGA"), total("3PM"), total("FTM"), total("FTA")
+    )
+    for i, k in enumerate(desired_order):
+        if k == "AFG%":
+            result[..., i] = afg
+        elif k == "FT%":
+            result[..., i] = ft
+        else:
+            result[..., i] = total(k)
+    return result
+
+
+# LeagueStrength of recent page states: key -> (stats_map, season, strength)
+STRENGTH_CACHE_SIZE = 16
+_strength_cache = OrderedDict()
+
+
+def _roster_signature(team_obj, active_players):
+    roster = tuple(
+        (p.playerId, p.name, p.proTeam, p.injuryStatus) for p in team_obj.roster
+    )
+    active = tuple(active_players) if active_players is not None else None
+    return team_obj.team_name, roster, active
+
+
+def get_league_strength(
+    teams,
+    season,
+    weeks,
+    stats_map,
+    desired_order,
+    alias_mapping,
+    lower_is_better=(),
+    unscored=(),
+    active_players=None,
+):
+    """
+    LeagueStrength of every team against every other for weeks, cached per
+    stats map, schedule, rosters and active player selection; picking a
+    different target team only slices it. Categories are compared at the
+    precision the strength page shows them with.
+    """
+    active_players = active_players or {}
+    key = (
+        id(stats_map),
+        id(season),
+        tuple(weeks),
+        tuple(desired_order),
+        tuple(sorted(alias_mapping.items())),
+        tuple(sorted(lower_is_better)),
+        tuple(sorted(unscored)),
+        tuple(
+            _roster_signature(team, active_players.get(team.team_name))
+            for team in teams
+        ),
+    )
+    with _stats_cache_lock:
+        cached = _strength_cache.get(key)
+        if cached is not None and cached[0] is stats_map and cached[1] is season:
+            _strength_cache.move_to_end(key)
+            return cached[2]
+
+    totals = calculate_league_projections(
+        teams,
+        season,
+        weeks,
+        stats_map,
+        desired_order,
+        alias_mapping,
+        active_players=active_players,
+    )
+    strength = LeagueStrength(
+        [team.team_name for team in teams],
+        weeks,
+        desired_order,
+        totals,
+        lower_is_better=lower_is_better,
+        unscored=unscored,
+        # Compared as displayed: percentages to 0.01%, counts to 0.1
+        decimals={k: 4 if k in ["AFG%", "FT%"] else 1 for k in desired_order},
+    )
+    with _stats_cache_lock:
+        _strength_cache[key] = (stats_map, season, strength)
+        _strength_cache.move_to_end(key)
+        while len(_strength_cache) > STRENGTH_CACHE_SIZE:
+            _strength_cache.popitem(last=False)
+    return strength
+
+
 def calculate_projected_stats_simple(
     team_obj, schedule_df, stats_map, desired_order, alias_mapping, active_players=None
 ):
@@ -375,73 +639,30 @@ def calculate_projected_stats_simple(
     if schedule_df is None:
         return base_totals
 
-    dates = schedule_df.index.tolist()
-
-    for player in team_obj.roster:
-        # Skip OUT players (unless explicitly selected via active_players)
-        if active_players is not None:
-            if player.name not in active_players:
-                continue
-        else:
-            if player.injuryStatus == "OUT":
-                continue
-
-        pro_team = player.proTeam
-        sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
-
-        # Count games
-        games_active = 0
-        if sched_col in schedule_df.columns:
-            for d in dates:
-                if schedule_df.loc[d, sched_col] == 1:
-                    games_active += 1
-
-        if games_active > 0:
-            p_stats = get_player_avg(player.name, stats_map)
-            if p_stats:
-                for k in base_totals:
-                    val = 0.0
-                    # Check alias mapping
-                    if k in p_stats:
-                        val = float(p_stats[k])
-                    elif k in alias_mapping and alias_mapping[k] in p_stats:
-                        val = float(p_stats[alias_mapping[k]])
-                    base_totals[k] += val * games_active
-
-    # Process non-roster players (added from league pool)
-    if active_players is not None:
-        roster_names = {p.name for p in team_obj.roster}
-        for p_name in active_players:
-            if p_name in roster_names:
-                continue  # Already processed above
-            p_stats = get_player_avg(p_name, stats_map)
-            if not p_stats:
-                continue
-            pro_team = p_stats.get("TEAM", "")
-            sched_col = TEAM_ABBREVIATION_MAPPING.get(pro_team, pro_team)
-            games_active = 0
-            if sched_col in schedule_df.columns:
-                for d in dates:
-                    if schedule_df.loc[d, sched_col] == 1:
-                        games_active += 1
-            if games_active > 0:
-                for k in base_totals:
-                    val = 0.0
-                    if k in p_stats:
-                        val = float(p_stats[k])
-                    elif k in alias_mapping and alias_mapping[k] in p_stats:
-                        val = float(p_stats[alias_mapping[k]])
-                    base_totals[k] += val * games_active
+    # Games per schedule team over the week, as a single period
+    games = (schedule_df.to_numpy() == 1).sum(axis=0)[None, :]
+    totals = project_league(
+        [_projection_entries(team_obj, active_players)],
+        games,
+        list(schedule_df.columns),
+        stats_map,
+        list(base_totals),
+        alias_mapping,
+    )
+    for k, value in zip(base_totals, totals[0, 0]):
+        base_totals[k] = float(value)
 
     # Compute derived stats
-    fgm = base_totals.get("FGM", 0)
-    fga = base_totals.get("FGA", 0)
-    threepm = base_totals.get("3PM", 0)
-    ftm = base_totals.get("FTM", 0)
-    fta = base_totals.get("FTA", 0)
+    afg_pct, ft_pct = shooting_percentages(
+        base_totals.get("FGM", 0),
+        base_totals.get("FGA", 0),
+        base_totals.get("3PM", 0),
+        base_totals.get("FTM", 0),
+        base_totals.get("FTA", 0),
+    )
 
     result = dict(base_totals)
-    result["AFG%"] = (fgm + 0.5 * threepm) / fga if fga > 0 else 0.0
-    result["FT%"] = ftm / fta if fta > 0 else 0.0
+    result["AFG%"] = float(afg_pct)
+    result["FT%"] = float(ft_pct)
 
     return result